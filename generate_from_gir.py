@@ -9,12 +9,21 @@ This script parses Flatpak-1.0.gir and generates:
 """
 
 import argparse
+import functools
+import hashlib
+import io
 import os
 import sys
-import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Tuple
+from typing import Dict, List, Optional, Set, TextIO, Tuple
+
+try:
+    # lxml's C parser is considerably faster on the multi-megabyte GIR files
+    from lxml import etree as ET
+except ImportError:
+    import xml.etree.ElementTree as ET
 
 # -----------------------------------------------------------------------------
 # Type mappings
@@ -113,13 +122,167 @@ CPP_TO_NAPI_TYPES = {
     "void": "Undefined",
 }
 
+# GIR types that are passed around as opaque GObject/boxed handles
+GOBJECT_GIR_TYPES = frozenset(
+    {
+        "Gio.File",
+        "Gio.Cancellable",
+        "Gio.FileMonitor",
+        "GLib.Bytes",
+        "GLib.HashTable",
+        "GLib.KeyFile",
+        "GLib.Variant",
+        "GLib.List",
+        "GLib.PtrArray",
+        "GLib.Strv",
+    }
+)
+
+# GIR types passed to and from JavaScript as numbers
+NUMERIC_GIR_TYPES = frozenset(
+    {
+        "gint",
+        "guint",
+        "gint8",
+        "guint8",
+        "gint16",
+        "guint16",
+        "gint32",
+        "guint32",
+        "gint64",
+        "guint64",
+        "glong",
+        "gulong",
+        "gshort",
+        "gushort",
+        "gsize",
+        "gssize",
+        "gdouble",
+        "gfloat",
+    }
+)
+
+# Numeric GIR types read from JavaScript as integers rather than doubles
+INTEGER_GIR_TYPES = frozenset(
+    {
+        "gint",
+        "guint",
+        "gint8",
+        "guint8",
+        "gint16",
+        "guint16",
+        "gint32",
+        "guint32",
+        "gint64",
+        "guint64",
+        "glong",
+        "gshort",
+        "gsize",
+        "gssize",
+    }
+)
+INT64_GIR_TYPES = frozenset({"gint64", "guint64"})
+
+# GIR type names (without namespace) whose C types carry a G prefix;
+# everything else is a Flatpak type
+GLIB_BASE_TYPES = frozenset(
+    {
+        "File",
+        "Cancellable",
+        "Bytes",
+        "HashTable",
+        "KeyFile",
+        "Variant",
+        "List",
+        "PtrArray",
+    }
+)
+
+# Flatpak object types that can appear as GPtrArray elements
+FLATPAK_ELEMENT_TYPES = frozenset(
+    {
+        "InstalledRef",
+        "RemoteRef",
+        "Remote",
+        "Ref",
+        "RelatedRef",
+        "TransactionOperation",
+        "Instance",
+        "Installation",
+    }
+)
+
+# Export names for the error quark functions
+QUARK_OVERRIDES = {
+    "flatpak_error_quark": "errorQuark",
+    "flatpak_portal_error_quark": "portalErrorQuark",
+}
+
+# Method name prefixes kept verbatim when converting to camelCase
+ACCESSOR_PREFIXES = frozenset({"get", "set", "is"})
+
+# Name suffixes identifying enum/flags types (GIR names and lowercased C names)
+ENUM_SUFFIXES = ("Type", "Flags", "Kind")
+ENUM_C_SUFFIXES = ("kind", "type", "flags")
+
 # -----------------------------------------------------------------------------
 # Data structures
 # -----------------------------------------------------------------------------
 
 
-@dataclass
-class Parameter:
+TYPE_IS_POINTER = 1
+TYPE_IS_ENUM = 2
+TYPE_IS_GOBJECT = 4
+
+
+@functools.lru_cache(maxsize=None)
+def classify_type(gir_type: str, c_type: str) -> int:
+    """Classify a GIR/C type pair as a bitmask of TYPE_IS_* flags"""
+    flags = TYPE_IS_POINTER if "*" in c_type else 0
+
+    # Check if this is an enum type: gir_type first, then c_type for Flatpak enums
+    if gir_type.endswith(ENUM_SUFFIXES) or (
+        "Flatpak" in c_type and c_type.lower().endswith(ENUM_C_SUFFIXES)
+    ):
+        flags |= TYPE_IS_ENUM
+    # Enum types are never treated as GObjects
+    elif (
+        gir_type.startswith("Flatpak.")
+        or "Flatpak" in c_type
+        or gir_type in GOBJECT_GIR_TYPES
+    ):
+        flags |= TYPE_IS_GOBJECT
+
+    return flags
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_c_type(type_name: str) -> str:
+    """Map a GIR type name without namespace to its C type name"""
+    return ("G" if type_name in GLIB_BASE_TYPES else "Flatpak") + type_name
+
+
+class TypedValueMixin:
+    """Type classification shared by Parameter and ReturnValue"""
+
+    __slots__ = ("_type_flags",)
+
+    def __post_init__(self):
+        # Classify once; the generators query these for every emitted line
+        self._type_flags = classify_type(self.gir_type, self.c_type)
+
+    def is_pointer(self) -> bool:
+        return bool(self._type_flags & TYPE_IS_POINTER)
+
+    def is_gobject(self) -> bool:
+        return bool(self._type_flags & TYPE_IS_GOBJECT)
+
+    def is_enum(self) -> bool:
+        return bool(self._type_flags & TYPE_IS_ENUM)
+
+
+@dataclass(slots=True)
+class Parameter(TypedValueMixin):
     name: str
     gir_type: str
     c_type: str
@@ -129,60 +292,18 @@ class Parameter:
     direction: str = "in"
     is_instance: bool = False
     caller_allocates: bool = False
+    _is_error: bool = field(init=False, repr=False, compare=False)
 
-    def is_pointer(self) -> bool:
-        return "*" in self.c_type
-
-    def is_gobject(self) -> bool:
-        # Exclude enum types from being treated as GObjects
-        if self.is_enum():
-            return False
-        return (
-            self.gir_type.startswith("Flatpak.")
-            or "Flatpak" in self.c_type
-            or self.gir_type
-            in [
-                "Gio.File",
-                "Gio.Cancellable",
-                "Gio.FileMonitor",
-                "GLib.Bytes",
-                "GLib.HashTable",
-                "GLib.KeyFile",
-                "GLib.Variant",
-                "GLib.List",
-                "GLib.PtrArray",
-                "GLib.Strv",
-            ]
-        )
-
-    def is_enum(self) -> bool:
-        # Check if this is an enum type
-        # Check gir_type first
-        if (
-            self.gir_type.endswith("Type")
-            or self.gir_type.endswith("Flags")
-            or self.gir_type.endswith("Kind")
-        ):
-            return True
-
-        # Check c_type for Flatpak enums
-        if "Flatpak" in self.c_type:
-            c_type_lower = self.c_type.lower()
-            if (
-                c_type_lower.endswith("kind")
-                or c_type_lower.endswith("type")
-                or c_type_lower.endswith("flags")
-            ):
-                return True
-
-        return False
+    def __post_init__(self):
+        TypedValueMixin.__post_init__(self)
+        self._is_error = self.name == "error" and self.gir_type == "GLib.Error"
 
     def is_error_param(self) -> bool:
-        return self.name == "error" and self.gir_type == "GLib.Error"
+        return self._is_error
 
 
-@dataclass
-class ReturnValue:
+@dataclass(slots=True)
+class ReturnValue(TypedValueMixin):
     gir_type: str
     c_type: str
     js_type: str
@@ -190,55 +311,8 @@ class ReturnValue:
     nullable: bool = False
     element_type: str = ""
 
-    def is_pointer(self) -> bool:
-        return "*" in self.c_type
-
-    def is_gobject(self) -> bool:
-        # Exclude enum types from being treated as GObjects
-        if self.is_enum():
-            return False
-        return (
-            self.gir_type.startswith("Flatpak.")
-            or "Flatpak" in self.c_type
-            or self.gir_type
-            in [
-                "Gio.File",
-                "Gio.Cancellable",
-                "Gio.FileMonitor",
-                "GLib.Bytes",
-                "GLib.HashTable",
-                "GLib.KeyFile",
-                "GLib.Variant",
-                "GLib.List",
-                "GLib.PtrArray",
-                "GLib.Strv",
-            ]
-        )
-
-    def is_enum(self) -> bool:
-        # Check if this is an enum type
-        # Check gir_type first
-        if (
-            self.gir_type.endswith("Type")
-            or self.gir_type.endswith("Flags")
-            or self.gir_type.endswith("Kind")
-        ):
-            return True
-
-        # Check c_type for Flatpak enums
-        if "Flatpak" in self.c_type:
-            c_type_lower = self.c_type.lower()
-            if (
-                c_type_lower.endswith("kind")
-                or c_type_lower.endswith("type")
-                or c_type_lower.endswith("flags")
-            ):
-                return True
-
-        return False
 
-
-@dataclass
+@dataclass(slots=True)
 class Function:
     name: str
     c_name: str
@@ -248,38 +322,61 @@ class Function:
     is_constructor: bool = False
     is_static: bool = False
     throws: bool = False
+    _js_name: str = field(init=False, repr=False, compare=False)
+    _js_params: str = field(init=False, repr=False, compare=False)
+    _js_method_params: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        # js_name() is looked up for every wrapper, export and hierarchy walk
+        self._js_name = self._compute_js_name()
+        # Inherited methods are emitted once per subclass
+        self._js_params = ", ".join([p.name for p in self.parameters])
+        self._js_method_params = ", ".join(
+            [p.name for p in self.parameters if not p.is_instance]
+        )
 
     def has_error_param(self) -> bool:
-        return any(p.is_error_param() for p in self.parameters)
+        return any(p._is_error for p in self.parameters)
 
     def js_name(self) -> str:
+        return self._js_name
+
+    def js_params(self) -> str:
+        """Comma-separated names of all parameters"""
+        return self._js_params
+
+    def js_method_params(self) -> str:
+        """Comma-separated names of the parameters other than the instance"""
+        return self._js_method_params
+
+    def _compute_js_name(self) -> str:
         if self.is_constructor:
             return "new"
         # First handle hyphenated names
         if "-" in self.name:
             # Convert hyphenated-name to camelCase
             parts = self.name.split("-")
-            if self.is_method and parts[0] in ["get", "set", "is"]:
+            if self.is_method and parts[0] in ACCESSOR_PREFIXES:
                 # Keep get/set/is prefix
-                return parts[0] + "".join(p.capitalize() for p in parts[1:] if p)
+                return parts[0] + "".join(map(str.capitalize, filter(None, parts[1:])))
             elif self.is_method:
-                return parts[0] + "".join(p.capitalize() for p in parts[1:] if p)
+                return parts[0] + "".join(map(str.capitalize, filter(None, parts[1:])))
             else:
                 # Standalone function
-                return parts[0] + "".join(p.capitalize() for p in parts[1:] if p)
+                return parts[0] + "".join(map(str.capitalize, filter(None, parts[1:])))
         # Convert snake_case to camelCase
         parts = self.name.split("_")
-        if self.is_method and parts[0] in ["get", "set", "is"]:
+        if self.is_method and parts[0] in ACCESSOR_PREFIXES:
             # Keep get/set/is prefix
-            return parts[0] + "".join(p.capitalize() for p in parts[1:])
+            return parts[0] + "".join(map(str.capitalize, parts[1:]))
         elif self.is_method:
-            return parts[0] + "".join(p.capitalize() for p in parts[1:])
+            return parts[0] + "".join(map(str.capitalize, parts[1:]))
         else:
             # Standalone function
-            return parts[0] + "".join(p.capitalize() for p in parts[1:])
+            return parts[0] + "".join(map(str.capitalize, parts[1:]))
 
 
-@dataclass
+@dataclass(slots=True)
 class Property:
     name: str
     gir_type: str
@@ -288,8 +385,20 @@ class Property:
     readable: bool = True
     writable: bool = False
     construct: bool = False
+    _getter_name: str = field(init=False, repr=False, compare=False)
+    _setter_name: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._getter_name = self._compute_getter_name()
+        self._setter_name = self._compute_setter_name()
 
     def getter_name(self) -> str:
+        return self._getter_name
+
+    def setter_name(self) -> str:
+        return self._setter_name
+
+    def _compute_getter_name(self) -> str:
         if self.name.startswith("is_"):
             return self.name
         # Handle hyphenated property names
@@ -297,14 +406,14 @@ class Property:
             return f"get_{self.name.replace('-', '_')}"
         return f"get_{self.name}"
 
-    def setter_name(self) -> str:
+    def _compute_setter_name(self) -> str:
         # Handle hyphenated property names
         if "-" in self.name:
             return f"set_{self.name.replace('-', '_')}"
         return f"set_{self.name}"
 
 
-@dataclass
+@dataclass(slots=True)
 class Class:
     name: str
     c_name: str
@@ -313,41 +422,102 @@ class Class:
     properties: List[Property] = field(default_factory=list)
 
 
-@dataclass
+@dataclass(slots=True)
 class Namespace:
     name: str
     classes: List[Class] = field(default_factory=list)
     functions: List[Function] = field(default_factory=list)
+    _function_export_names: Optional[Dict[str, str]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def function_export_names(self) -> Dict[str, str]:
+        """Return mapping from function C name to unique export name"""
+        # Shared by the C++ and JavaScript generators; built once, after parsing
+        if self._function_export_names is not None:
+            return self._function_export_names
+
+        exported_names = set()
+        mapping = {}
+        for func in self.functions:
+            js_name = func.js_name()
+            # Rename quark functions
+            override = QUARK_OVERRIDES.get(func.c_name)
+            if override and "quark" in js_name:
+                js_name = override
+            # Handle duplicate function names (after quark renaming)
+            if js_name in exported_names:
+                # Add prefix to avoid duplicates
+                js_name = f"{func.c_name.partition('_')[0]}_{js_name}"
+            exported_names.add(js_name)
+            mapping[func.c_name] = js_name
+        self._function_export_names = mapping
+        return mapping
 
 
 class GIRParser:
     def __init__(self, gir_file: str):
         self.gir_file = gir_file
-        self.tree = ET.parse(gir_file)
-        self.root = self.tree.getroot()
         self.ns = {
             "gi": "http://www.gtk.org/introspection/core/1.0",
             "c": "http://www.gtk.org/introspection/c/1.0",
             "glib": "http://www.gtk.org/introspection/glib/1.0",
         }
+        # Pre-qualified tag/attribute names so lookups skip XPath prefix parsing
+        gi = f"{{{self.ns['gi']}}}"
+        self._TAG_CLASS = gi + "class"
+        self._TAG_FUNCTION = gi + "function"
+        self._TAG_CONSTRUCTOR = gi + "constructor"
+        self._TAG_METHOD = gi + "method"
+        self._TAG_STATIC_METHOD = gi + "static-method"
+        self._TAG_PROPERTY = gi + "property"
+        self._TAG_PARAMETERS = gi + "parameters"
+        self._TAG_PARAMETER = gi + "parameter"
+        self._TAG_INSTANCE_PARAMETER = gi + "instance-parameter"
+        self._TAG_RETURN_VALUE = gi + "return-value"
+        self._TAG_TYPE = gi + "type"
+        self._TAG_ARRAY = gi + "array"
+        self._C_TYPE_ATTR = f"{{{self.ns['c']}}}type"
+        self._C_IDENT_ATTR = f"{{{self.ns['c']}}}identifier"
+        # Flyweight pools: structurally identical parameters/return values
+        # (e.g. every nullable GCancellable*) share one immutable instance
+        self._param_pool: Dict[tuple, Parameter] = {}
+        self._return_pool: Dict[tuple, ReturnValue] = {}
 
     def parse(self) -> Namespace:
         """Parse the entire GIR file"""
         namespace = Namespace(name="Flatpak")
         seen_c_names = set()
 
-        # Find all classes
-        for class_elem in self.root.findall(".//gi:class", self.ns):
-            cls = self.parse_class(class_elem)
-            if cls:
-                namespace.classes.append(cls)
+        # Stream the file instead of materializing the whole DOM: each
+        # <class>/<function> is handled as soon as its end tag is seen, and
+        # every top-level namespace entry is dropped once it has closed.
+        depth = 0
+        container = None
+        for event, elem in ET.iterparse(self.gir_file, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                if depth == 2:
+                    container = elem
+                continue
 
-        # Find all standalone functions
-        for func_elem in self.root.findall(".//gi:function", self.ns):
-            func = self.parse_function(func_elem)
-            if func and func.c_name not in seen_c_names:
-                namespace.functions.append(func)
-                seen_c_names.add(func.c_name)
+            depth -= 1
+            if elem.tag == self._TAG_CLASS:
+                cls = self.parse_class(elem)
+                if cls:
+                    namespace.classes.append(cls)
+            elif elem.tag == self._TAG_FUNCTION:
+                # Standalone functions, including those nested in classes/records.
+                # Duplicates are recognized by C identifier before parsing them.
+                c_name = elem.get(self._C_IDENT_ATTR) or elem.get("name")
+                if c_name not in seen_c_names:
+                    func = self.parse_function(elem)
+                    if func:
+                        namespace.functions.append(func)
+                        seen_c_names.add(func.c_name)
+
+            if depth == 2:
+                container.clear()
 
         return namespace
 
@@ -357,7 +527,7 @@ class GIRParser:
         if not name:
             return None
 
-        c_name = class_elem.get(f"{{{self.ns['c']}}}type")
+        c_name = class_elem.get(self._C_TYPE_ATTR)
         if not c_name:
             c_name = f"Flatpak{name}"
 
@@ -370,29 +540,34 @@ class GIRParser:
 
         cls = Class(name=name, c_name=c_name, parent=parent)
 
-        # Parse constructors
-        for constr_elem in class_elem.findall(".//gi:constructor", self.ns):
-            func = self.parse_function(constr_elem, is_constructor=True)
-            if func:
-                cls.functions.append(func)
-
-        # Parse methods
-        for method_elem in class_elem.findall(".//gi:method", self.ns):
-            func = self.parse_function(method_elem, is_method=True)
-            if func:
-                cls.functions.append(func)
-
-        # Parse static methods
-        for static_elem in class_elem.findall(".//gi:static-method", self.ns):
-            func = self.parse_function(static_elem, is_method=True, is_static=True)
-            if func:
-                cls.functions.append(func)
-
-        # Parse properties
-        for prop_elem in class_elem.findall(".//gi:property", self.ns):
-            prop = self.parse_property(prop_elem)
-            if prop:
-                cls.properties.append(prop)
+        # Class members are direct children, so one pass over them suffices.
+        # Functions are still grouped as constructors, methods, then static
+        # methods to keep the emitted order stable.
+        constructors = []
+        methods = []
+        static_methods = []
+        for child in class_elem:
+            tag = child.tag
+            if tag == self._TAG_CONSTRUCTOR:
+                func = self.parse_function(child, is_constructor=True)
+                if func:
+                    constructors.append(func)
+            elif tag == self._TAG_METHOD:
+                func = self.parse_function(child, is_method=True)
+                if func:
+                    methods.append(func)
+            elif tag == self._TAG_STATIC_METHOD:
+                func = self.parse_function(child, is_method=True, is_static=True)
+                if func:
+                    static_methods.append(func)
+            elif tag == self._TAG_PROPERTY:
+                prop = self.parse_property(child)
+                if prop:
+                    cls.properties.append(prop)
+
+        cls.functions.extend(constructors)
+        cls.functions.extend(methods)
+        cls.functions.extend(static_methods)
 
         return cls
 
@@ -408,74 +583,49 @@ class GIRParser:
         if not name:
             return None
 
-        c_name = func_elem.get(f"{{{self.ns['c']}}}identifier")
+        c_name = func_elem.get(self._C_IDENT_ATTR)
         if not c_name:
             c_name = name
 
         # Check if function throws errors
         throws = func_elem.get("throws", "0") == "1"
 
-        # Parse parameters
-        parameters = []
-        has_callback = False
-        has_array_param = False
         # Look for parameters under gi:parameters container
-        params_container = func_elem.find("gi:parameters", self.ns)
+        params_container = func_elem.find(self._TAG_PARAMETERS)
         if params_container is not None:
-            for param_elem in params_container.findall("gi:parameter", self.ns):
-                # Check for array parameters
-                if param_elem.find("gi:array", self.ns) is not None:
-                    has_array_param = True
-                param = self.parse_parameter(param_elem, is_instance=False)
-                if param:
-                    # Check for callback parameters
-                    if (
-                        "callback" in param.gir_type.lower()
-                        or "Callback" in param.gir_type
-                    ):
-                        has_callback = True
-                    parameters.append(param)
+            param_elems = params_container.findall(self._TAG_PARAMETER)
         else:
             # Fallback to searching all parameter elements
-            for param_elem in func_elem.findall(".//gi:parameter", self.ns):
-                # Check for array parameters
-                if param_elem.find("gi:array", self.ns) is not None:
-                    has_array_param = True
-                param = self.parse_parameter(param_elem, is_instance=False)
-                if param:
-                    # Check for callback parameters
-                    if (
-                        "callback" in param.gir_type.lower()
-                        or "Callback" in param.gir_type
-                    ):
-                        has_callback = True
-                    parameters.append(param)
+            param_elems = list(func_elem.iter(self._TAG_PARAMETER))
+
+        # Skip functions with array or callback parameters (too complex for
+        # initial version) before any Parameter objects are built for them
+        for param_elem in param_elems:
+            if self._is_unsupported_parameter(param_elem):
+                return None
+
+        # Parse parameters
+        parameters = []
+        for param_elem in param_elems:
+            param = self.parse_parameter(param_elem, is_instance=False)
+            if param:
+                parameters.append(param)
 
         # Parse return value
-        return_elem = func_elem.find("gi:return-value", self.ns)
+        return_elem = func_elem.find(self._TAG_RETURN_VALUE)
         if return_elem is not None:
             return_value = self.parse_return_value(return_elem)
         else:
-            return_value = ReturnValue(
-                gir_type="none", c_type="void", js_type="void", transfer="none"
-            )
+            return_value = self._intern_return_value("none", "void", "none", False)
 
         # For methods (non-static), check for instance-parameter
         if is_method and not is_static:
-            instance_param_elem = func_elem.find("gi:instance-parameter", self.ns)
+            instance_param_elem = func_elem.find(self._TAG_INSTANCE_PARAMETER)
             if instance_param_elem is not None:
                 param = self.parse_parameter(instance_param_elem, is_instance=True)
                 if param:
                     parameters.insert(0, param)
 
-        # Skip functions with callback parameters (too complex for initial version)
-        if has_callback:
-            return None
-
-        # Skip functions with array parameters (too complex for initial version)
-        if has_array_param:
-            return None
-
         return Function(
             name=name,
             c_name=c_name,
@@ -487,6 +637,18 @@ class GIRParser:
             throws=throws,
         )
 
+    def _is_unsupported_parameter(self, param_elem) -> bool:
+        """Check for array or callback parameters without parsing them"""
+        if param_elem.find(self._TAG_ARRAY) is not None:
+            return True
+        # Mirror parse_parameter: only named, typed parameters are considered
+        if not param_elem.get("name", ""):
+            return False
+        type_elem = param_elem.find(self._TAG_TYPE)
+        if type_elem is None:
+            return False
+        return "callback" in type_elem.get("name", "").lower()
+
     def parse_parameter(self, param_elem, is_instance=False) -> Optional[Parameter]:
         """Parse a parameter element"""
         name = param_elem.get("name", "")
@@ -494,12 +656,12 @@ class GIRParser:
             return None
 
         # Get type info
-        type_elem = param_elem.find("gi:type", self.ns)
+        type_elem = param_elem.find(self._TAG_TYPE)
         if type_elem is None:
             return None
 
         gir_type = type_elem.get("name", "")
-        c_type = type_elem.get(f"{{{self.ns['c']}}}type")
+        c_type = type_elem.get(self._C_TYPE_ATTR)
         if c_type is None:
             c_type = ""
 
@@ -512,50 +674,52 @@ class GIRParser:
         # Detect output parameters by name convention and type
         if direction == "in":
             # Check for common output parameter naming patterns
-            if (
-                name.endswith("_out")
-                or name.endswith("_inout")
-                or name.startswith("out_")
-            ):
-                direction = "out"
-            # Check for pointer-to-pointer types (common for output parameters)
-            elif c_type.count("*") == 2:  # e.g., FlatpakInstance**
+            if name.endswith(("_out", "_inout")) or name.startswith("out_"):
                 direction = "out"
-            # Also check for pointer types with output naming patterns
-            elif (
-                name.endswith("_out")
-                or name.endswith("_inout")
-                or name.startswith("out_")
-            ) and "*" in c_type:
+            # Check for pointer-to-pointer types (common for output parameters);
+            # the substring test rules out most types before counting
+            elif "**" in c_type and c_type.count("*") == 2:  # e.g., FlatpakInstance**
                 direction = "out"
 
         # Map to JS type
-        js_type = self.map_gir_to_js_type(gir_type)
-
-        return Parameter(
-            name=name,
-            gir_type=gir_type,
-            c_type=c_type,
-            js_type=js_type,
-            transfer=transfer,
-            nullable=nullable,
-            direction=direction,
-            is_instance=is_instance,
-            caller_allocates=caller_allocates,
+        key = (
+            name,
+            gir_type,
+            c_type,
+            transfer,
+            nullable,
+            direction,
+            is_instance,
+            caller_allocates,
         )
+        param = self._param_pool.get(key)
+        if param is None:
+            param = Parameter(
+                name=name,
+                gir_type=gir_type,
+                c_type=c_type,
+                js_type=self.map_gir_to_js_type(gir_type),
+                transfer=transfer,
+                nullable=nullable,
+                direction=direction,
+                is_instance=is_instance,
+                caller_allocates=caller_allocates,
+            )
+            self._param_pool[key] = param
+        return param
 
     def parse_return_value(self, return_elem) -> ReturnValue:
         """Parse a return value element"""
         # Check for array type first
-        array_elem = return_elem.find("gi:array", self.ns)
+        array_elem = return_elem.find(self._TAG_ARRAY)
         if array_elem is not None:
             # Handle array return type
-            c_type = array_elem.get(f"{{{self.ns['c']}}}type", "")
+            c_type = array_elem.get(self._C_TYPE_ATTR, "")
             array_name = array_elem.get("name", "")
             element_type = ""
 
             # Get the element type inside the array
-            elem_type_elem = array_elem.find("gi:type", self.ns)
+            elem_type_elem = array_elem.find(self._TAG_TYPE)
             if elem_type_elem is not None:
                 element_type = elem_type_elem.get("name", "")
 
@@ -584,51 +748,51 @@ class GIRParser:
 
             transfer = return_elem.get("transfer-ownership", "none")
             nullable = return_elem.get("nullable", "0") == "1"
-            js_type = self.map_gir_to_js_type(gir_type)
 
-            return ReturnValue(
-                gir_type=gir_type,
-                c_type=c_type,
-                js_type=js_type,
-                transfer=transfer,
-                nullable=nullable,
-                element_type=element_type,
+            return self._intern_return_value(
+                gir_type, c_type, transfer, nullable, element_type
             )
 
         # Check for regular type
-        type_elem = return_elem.find("gi:type", self.ns)
+        type_elem = return_elem.find(self._TAG_TYPE)
         if type_elem is None:
             # Default to void
-            return ReturnValue(
-                gir_type="none", c_type="void", js_type="void", transfer="none"
-            )
+            return self._intern_return_value("none", "void", "none", False)
 
         gir_type = type_elem.get("name", "none")
-        c_type = type_elem.get(f"{{{self.ns['c']}}}type")
+        c_type = type_elem.get(self._C_TYPE_ATTR)
         if c_type is None:
-            # If c_type is not provided, try to map from gir_type
-            if gir_type == "none":
-                c_type = "void"
-            elif gir_type in GIR_TO_CPP_TYPES:
-                c_type = GIR_TO_CPP_TYPES[gir_type]
-            elif gir_type == "GLib.Strv":
-                c_type = "char**"
-            else:
-                c_type = "void"
+            # If c_type is not provided, try to map from gir_type ("none" and
+            # "GLib.Strv" are in the table); unknown types fall back to void
+            c_type = GIR_TO_CPP_TYPES.get(gir_type, "void")
 
         transfer = return_elem.get("transfer-ownership", "none")
         nullable = return_elem.get("nullable", "0") == "1"
 
-        js_type = self.map_gir_to_js_type(gir_type)
+        return self._intern_return_value(gir_type, c_type, transfer, nullable)
 
-        return ReturnValue(
-            gir_type=gir_type,
-            c_type=c_type,
-            js_type=js_type,
-            transfer=transfer,
-            nullable=nullable,
-            element_type="",
-        )
+    def _intern_return_value(
+        self,
+        gir_type: str,
+        c_type: str,
+        transfer: str,
+        nullable: bool,
+        element_type: str = "",
+    ) -> ReturnValue:
+        """Return the shared ReturnValue for these attributes"""
+        key = (gir_type, c_type, transfer, nullable, element_type)
+        return_value = self._return_pool.get(key)
+        if return_value is None:
+            return_value = ReturnValue(
+                gir_type=gir_type,
+                c_type=c_type,
+                js_type=self.map_gir_to_js_type(gir_type),
+                transfer=transfer,
+                nullable=nullable,
+                element_type=element_type,
+            )
+            self._return_pool[key] = return_value
+        return return_value
 
     def parse_property(self, prop_elem) -> Optional[Property]:
         """Parse a property element"""
@@ -637,12 +801,12 @@ class GIRParser:
             return None
 
         # Get type info
-        type_elem = prop_elem.find("gi:type", self.ns)
+        type_elem = prop_elem.find(self._TAG_TYPE)
         if type_elem is None:
             return None
 
         gir_type = type_elem.get("name", "")
-        c_type = type_elem.get(f"{{{self.ns['c']}}}type")
+        c_type = type_elem.get(self._C_TYPE_ATTR)
         if c_type is None:
             c_type = ""
 
@@ -662,21 +826,19 @@ class GIRParser:
             construct=construct,
         )
 
-    def map_gir_to_js_type(self, gir_type: str) -> str:
-        """Map GIR type to JavaScript type"""
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def map_gir_to_js_type(gir_type: str) -> str:
+        """Map GIR type to JavaScript type (memoized per distinct gir_type)"""
         # Check for Flatpak types
         if gir_type.startswith("Flatpak."):
             # Check for enum types (end with Type or Flags)
-            if gir_type.endswith("Type") or gir_type.endswith("Flags"):
+            if gir_type.endswith(("Type", "Flags")):
                 return "number"
             return "External"
 
         # Check for Flatpak enum types without Flatpak. prefix (e.g., RefKind)
-        if (
-            gir_type.endswith("Kind")
-            or gir_type.endswith("Type")
-            or gir_type.endswith("Flags")
-        ):
+        if gir_type.endswith(ENUM_SUFFIXES):
             return "number"
 
         # Check for array types
@@ -684,428 +846,456 @@ class GIRParser:
             return "Array"
 
         # Check for GObject types
-        if gir_type in [
-            "Gio.File",
-            "Gio.Cancellable",
-            "Gio.FileMonitor",
-            "GLib.Bytes",
-            "GLib.HashTable",
-            "GLib.KeyFile",
-            "GLib.Variant",
-            "GLib.List",
-            "GLib.PtrArray",
-            "GLib.Strv",
-        ]:
+        if gir_type in GOBJECT_GIR_TYPES:
             return "External"
 
         # Check for arrays
         if gir_type.endswith("[]"):
             return "Array"
 
-        # Check for basic types
-        if gir_type in GIR_TO_JS_TYPES:
-            return GIR_TO_JS_TYPES[gir_type]
+        # Check for basic types, defaulting to any
+        return GIR_TO_JS_TYPES.get(gir_type, "any")
+
+
+# -----------------------------------------------------------------------------
+# C++ wrapper templates
+# -----------------------------------------------------------------------------
+
+# Error and argument checks shared by every wrapper, emitted once after
+# the includes
+ARG_HELPERS = """\
+// After throwing, wrappers return an empty Napi::Value: the result is
+// ignored while an exception is pending, so there is no need to fetch null.
+
+// Throws a GError as a JavaScript exception and returns from the wrapper
+#define FLATPAK_CHECK_ERR(e)                                            \\
+  do {                                                                  \\
+    if (e) {                                                            \\
+      Napi::Error::New(env, (e)->message).ThrowAsJavaScriptException(); \\
+      g_error_free(e);                                                  \\
+      return Napi::Value();                                             \\
+    }                                                                   \\
+  } while (0)
+
+// Throws a TypeError and returns false unless argument `index` has `type`
+static inline bool RequireArg(const Napi::CallbackInfo& info, size_t index,
+                              napi_valuetype type, const char* message) {
+  if (info.Length() <= index || info[index].Type() != type) {
+    Napi::TypeError::New(info.Env(), message).ThrowAsJavaScriptException();
+    return false;
+  }
+  return true;
+}
+
+// True when optional argument `index` was passed and is not null/undefined
+static inline bool HasArg(const Napi::CallbackInfo& info, size_t index) {
+  return info.Length() > index && !info[index].IsNull() && !info[index].IsUndefined();
+}
+
+// Copies a JS string into the caller's stack buffer, falling back to `heap`
+// when it may not fit. Node-API truncates at character boundaries, so a
+// result within 4 bytes of the end could be a truncated copy.
+static inline const char* ReadUtf8Arg(Napi::Value value, char* buf, size_t size,
+                                      std::string& heap) {
+  size_t len = 0;
+  napi_get_value_string_utf8(value.Env(), value, buf, size, &len);
+  if (len + 4 < size) {
+    return buf;
+  }
+  heap = value.As<Napi::String>().Utf8Value();
+  return heap.c_str();
+}
+
+"""
+
+# Fixed parts of every generated wrapper, formatted once per function
+WRAPPER_OPEN_TMPL = """\
+Napi::Value Wrap_{name}(const Napi::CallbackInfo& info) {{
+  Napi::Env env = info.Env();
+
+"""
+
+# Instance methods receive the wrapped object as the first JS argument
+INSTANCE_CHECK_TMPL = """\
+  if (!RequireArg(info, 0, napi_external, "Expected {cls_name} instance")) {{
+    return Napi::Value();
+  }}
+  {c_name}* self = info[0].As<Napi::External<{c_name}>>().Data();
+
+  if (!self) {{
+    Napi::Error::New(env, "Invalid {cls_name} instance (null pointer)").ThrowAsJavaScriptException();
+    return Napi::Value();
+  }}
+
+"""
+
+ERROR_CHECK_TMPL = """\
+  FLATPAK_CHECK_ERR({error});
+
+"""
+
+WRAPPER_CLOSE = "}\n\n"
+
+# Wrappers for functions without parameters or errors that return a
+# scalar are emitted as a single return statement, without the usual
+# scaffolding; keyed by the GIR return type
+FAST_WRAPPER_TMPL = """\
+Napi::Value Wrap_{name}(const Napi::CallbackInfo& info) {{
+{body}
+}}
+
+"""
+
+FAST_NUMBER_RETURN = "  return Napi::Number::New(info.Env(), {call});"
+FAST_RETURN_TMPLS = {
+    "none": "  {call};\n  return info.Env().Undefined();",
+    "gboolean": "  return Napi::Boolean::New(info.Env(), {call});",
+    "GLib.Quark": FAST_NUMBER_RETURN,
+    **dict.fromkeys(NUMERIC_GIR_TYPES, FAST_NUMBER_RETURN),
+}
+
+# Argument extraction blocks, one per conversion kind
+STRING_PARAM_TMPL = """\
+  if (!RequireArg(info, {idx}, napi_string, "Expected string for parameter '{name}'")) {{
+    return Napi::Value();
+  }}
+  char {name}_buf[256];
+  std::string {name}_str;
+  const char* {name} = ReadUtf8Arg(info[{idx}], {name}_buf, sizeof({name}_buf), {name}_str);
+"""
+
+NULLABLE_STRING_PARAM_TMPL = """\
+  const char* {name} = NULL;
+  char {name}_buf[256];
+  std::string {name}_str;
+  if (HasArg(info, {idx})) {{
+    if (!RequireArg(info, {idx}, napi_string, "Expected string or null for parameter '{name}'")) {{
+      return Napi::Value();
+    }}
+    {name} = ReadUtf8Arg(info[{idx}], {name}_buf, sizeof({name}_buf), {name}_str);
+  }}
+"""
+
+BOOLEAN_PARAM_TMPL = """\
+  if (!RequireArg(info, {idx}, napi_boolean, "Expected boolean for parameter '{name}'")) {{
+    return Napi::Value();
+  }}
+  gboolean {name} = info[{idx}].As<Napi::Boolean>().Value();
+"""
+
+NUMBER_PARAM_TMPL = """\
+  if (!RequireArg(info, {idx}, napi_number, "Expected number for parameter '{name}'")) {{
+    return Napi::Value();
+  }}
+  {c_type} {name} = info[{idx}].As<Napi::Number>().{getter}();
+"""
+
+ENUM_PARAM_TMPL = """\
+  if (!RequireArg(info, {idx}, napi_number, "Expected number for enum parameter '{name}'")) {{
+    return Napi::Value();
+  }}
+  {c_type} {name} = static_cast<{c_type}>(info[{idx}].As<Napi::Number>().Int32Value());
+"""
+
+GOBJECT_PARAM_TMPL = """\
+  if (!RequireArg(info, {idx}, napi_external, "Expected external object for parameter '{name}'")) {{
+    return Napi::Value();
+  }}
+  {c_type} {name} = info[{idx}].As<Napi::External<{base_type}>>().Data();
+"""
+
+NULLABLE_GOBJECT_PARAM_TMPL = """\
+  {c_type} {name} = NULL;
+  if (HasArg(info, {idx})) {{
+    if (!RequireArg(info, {idx}, napi_external, "Expected external object or null for parameter '{name}'")) {{
+      return Napi::Value();
+    }}
+    {name} = info[{idx}].As<Napi::External<{base_type}>>().Data();
+  }}
+"""
+
+
+# The instance check only varies per class and the error check per error
+# variable name, so each distinct chunk is rendered once and reused for
+# every wrapper that needs it.
+@functools.lru_cache(maxsize=None)
+def render_instance_check(cls_name: str, c_name: str) -> str:
+    return INSTANCE_CHECK_TMPL.format(cls_name=cls_name, c_name=c_name)
+
+
+@functools.lru_cache(maxsize=None)
+def render_error_check(error_name: str) -> str:
+    return ERROR_CHECK_TMPL.format(error=error_name)
 
-        # Default to any
-        return "any"
+
+# Class wrappers are rendered in worker processes once a namespace has at
+# least this many classes; below it, process start-up outweighs the gain
+PARALLEL_CLASS_THRESHOLD = 32
 
 
 class CppGenerator:
     def __init__(self, namespace: Namespace):
         self.namespace = namespace
-        self.output = []
+        self.buf = io.StringIO()
+        self._param_code_cache: Dict[tuple, Tuple[str, str]] = {}
+        self._wrapper_body_cache: Dict[tuple, Tuple[str, str]] = {}
+
+        # Conversions for exact GIR types; anything else falls through to the
+        # enum/GObject classification in the generate_* methods
+        self._param_handlers = {
+            "utf8": self._param_string,
+            "filename": self._param_string,
+            "gboolean": self._param_boolean,
+        }
+        self._param_handlers.update(
+            dict.fromkeys(NUMERIC_GIR_TYPES, self._param_number)
+        )
+        self._return_handlers = {
+            "none": self._return_none,
+            "utf8": self._return_string,
+            "filename": self._return_string,
+            "gboolean": self._return_boolean,
+            "GLib.Quark": self._return_number,
+            "GLib.Strv": self._return_strv,
+            "GLib.PtrArray": self._return_ptr_array,
+        }
+        self._return_handlers.update(
+            dict.fromkeys(NUMERIC_GIR_TYPES, self._return_number)
+        )
 
     def generate(self) -> str:
         """Generate C++ wrapper code"""
-        self.output = []
-        self.output.append("// Generated by generate_from_gir.py")
-        self.output.append("// DO NOT EDIT THIS FILE DIRECTLY")
-        self.output.append("")
-        self.output.append("#include <flatpak/flatpak.h>")
-        self.output.append("#include <glib.h>")
-        self.output.append("#include <memory>")
-        self.output.append("#include <napi.h>")
-        self.output.append("#include <string>")
-        self.output.append("#include <vector>")
-        self.output.append("")
+        out = io.StringIO()
+        self.write_to(out)
+        return out.getvalue()
+
+    def write_to(self, out: TextIO):
+        """Generate C++ wrapper code straight into a text stream"""
+        self.buf = out
+        self.buf.write("// Generated by generate_from_gir.py\n")
+        self.buf.write("// DO NOT EDIT THIS FILE DIRECTLY\n")
+        self.buf.write("\n")
+        self.buf.write("#include <flatpak/flatpak.h>\n")
+        self.buf.write("#include <glib.h>\n")
+        self.buf.write("#include <memory>\n")
+        self.buf.write("#include <napi.h>\n")
+        self.buf.write("#include <string>\n")
+        self.buf.write("#include <vector>\n")
+        self.buf.write("\n")
+        self.buf.write(ARG_HELPERS)
 
         self.generate_class_forward_decls()
-        self.output.append("")
+        self.buf.write("\n")
         self.generate_class_wrappers()
-        self.output.append("")
+        self.buf.write("\n")
         self.generate_init_function()
 
-        return "\n".join(self.output)
-
     def generate_class_forward_decls(self):
         """Generate forward declarations for wrapper functions"""
+        write = self.buf.write
+        # Constructors, static and instance methods share the same signature
         for cls in self.namespace.classes:
+            cls_name = cls.name
             for func in cls.functions:
-                if func.is_constructor:
-                    self.output.append(
-                        f"Napi::Value Wrap_{cls.name}_{func.name}(const Napi::CallbackInfo& info);"
-                    )
-                elif func.is_static:
-                    self.output.append(
-                        f"Napi::Value Wrap_{cls.name}_{func.name}(const Napi::CallbackInfo& info);"
-                    )
-                else:
-                    self.output.append(
-                        f"Napi::Value Wrap_{cls.name}_{func.name}(const Napi::CallbackInfo& info);"
-                    )
+                write(
+                    f"Napi::Value Wrap_{cls_name}_{func.name}(const Napi::CallbackInfo& info);\n"
+                )
 
         for func in self.namespace.functions:
-            self.output.append(
-                f"Napi::Value Wrap_{func.c_name}(const Napi::CallbackInfo& info);"
-            )
+            write(f"Napi::Value Wrap_{func.c_name}(const Napi::CallbackInfo& info);\n")
 
     def generate_class_wrappers(self):
         """Generate wrapper functions for each class"""
-        for cls in self.namespace.classes:
-            for func in cls.functions:
-                if func.is_constructor:
-                    self.generate_constructor_wrapper(cls, func)
-                elif func.is_static:
-                    self.generate_static_method_wrapper(cls, func)
-                else:
-                    self.generate_method_wrapper(cls, func)
+        classes = self.namespace.classes
+        if len(classes) >= PARALLEL_CLASS_THRESHOLD:
+            # Each class renders independently; map() keeps the output order
+            with ProcessPoolExecutor() as executor:
+                for chunk in executor.map(render_class_wrappers, classes):
+                    self.buf.write(chunk)
+        else:
+            for cls in classes:
+                self.generate_wrappers_for_class(cls)
 
         for func in self.namespace.functions:
             self.generate_function_wrapper(func)
 
+    def generate_wrappers_for_class(self, cls: Class):
+        """Generate wrapper functions for a single class"""
+        for func in cls.functions:
+            if func.is_constructor:
+                self.generate_constructor_wrapper(cls, func)
+            elif func.is_static:
+                self.generate_static_method_wrapper(cls, func)
+            else:
+                self.generate_method_wrapper(cls, func)
+
     def generate_constructor_wrapper(self, cls: Class, func: Function):
         """Generate wrapper for a constructor"""
-        self.output.append(
-            f"Napi::Value Wrap_{cls.name}_{func.name}(const Napi::CallbackInfo& info) {{"
-        )
-        self.output.append("  Napi::Env env = info.Env();")
-        self.output.append("")
-
-        # Handle instance parameter (implicit 'this')
-        cpp_params = []
-
-        # Generate parameter extraction code
-        # JavaScript parameters start at index 0 (no instance parameter for constructors)
-        js_param_index = 0
-        for param in func.parameters:
-            if param.is_instance:
-                # Skip instance parameter for constructors
-                continue
-            self.generate_parameter_code(param, js_param_index, cpp_params)
-            js_param_index += 1
-
-        # Handle error parameter
-        error_param_name = None
-        for param in func.parameters:
-            if param.is_error_param():
-                error_param_name = param.name
-                break
-
-        # If function throws but no error param found, add one
-        if func.throws and not error_param_name:
-            error_param_name = "error"
-
-        if error_param_name:
-            self.output.append(f"  GError* {error_param_name} = NULL;")
-
-        # Generate function call
-        if func.return_value.c_type == "void":
-            call_line = f"  {func.c_name}("
-            call_line += ", ".join(cpp_params)
-            if error_param_name:
-                if cpp_params:
-                    call_line += f", &{error_param_name}"
-                else:
-                    call_line += f"&{error_param_name}"
-            call_line += ");"
-            self.output.append(call_line)
-            self.output.append("")
-            result_var = None
-        else:
-            result_var = "result"
-            call_line = f"  {func.return_value.c_type} {result_var} = {func.c_name}("
-            call_line += ", ".join(cpp_params)
-            if error_param_name:
-                if cpp_params:
-                    call_line += f", &{error_param_name}"
-                else:
-                    call_line += f"&{error_param_name}"
-            call_line += ");"
-            self.output.append(call_line)
-            self.output.append("")
-
-        # Error handling
-        if error_param_name:
-            self.output.append(f"  if ({error_param_name}) {{")
-            self.output.append(
-                f"    Napi::Error::New(env, {error_param_name}->message).ThrowAsJavaScriptException();"
-            )
-            self.output.append(f"    g_error_free({error_param_name});")
-            self.output.append("    return env.Null();")
-            self.output.append("  }")
-            self.output.append("")
-
-        # Return conversion
-        if result_var is not None:
-            self.generate_return_conversion(func.return_value, result_var)
-        else:
-            self.generate_return_conversion(func.return_value, "")
-        self.output.append("}")
-        self.output.append("")
+        # No instance parameter for constructors, JS arguments start at 0
+        self._generate_wrapper(f"{cls.name}_{func.name}", func, skip_instance=True)
 
     def generate_method_wrapper(self, cls: Class, func: Function):
         """Generate wrapper for an instance method"""
-        self.output.append(
-            f"Napi::Value Wrap_{cls.name}_{func.name}(const Napi::CallbackInfo& info) {{"
-        )
-        self.output.append("  Napi::Env env = info.Env();")
-        self.output.append("")
-
-        # First parameter is the instance (this)
-        self.output.append("  if (info.Length() < 1 || !info[0].IsExternal()) {")
-        self.output.append(
-            f'    Napi::TypeError::New(env, "Expected {cls.name} instance").ThrowAsJavaScriptException();'
-        )
-        self.output.append("    return env.Null();")
-        self.output.append("  }")
-        self.output.append(
-            f"  {cls.c_name}* self = info[0].As<Napi::External<{cls.c_name}>>().Data();"
+        # JS argument 0 is the instance, the rest start at index 1
+        self._generate_wrapper(
+            f"{cls.name}_{func.name}", func, instance_cls=cls, skip_instance=True
         )
-        self.output.append("")
-        self.output.append("  if (!self) {")
-        self.output.append(
-            f'    Napi::Error::New(env, "Invalid {cls.name} instance (null pointer)").ThrowAsJavaScriptException();'
-        )
-        self.output.append("    return env.Null();")
-        self.output.append("  }")
-        self.output.append("")
-
-        # Generate parameter extraction code (skip first param for instance)
-        cpp_params = ["self"]
-
-        # JavaScript parameters start at index 1 (index 0 is the instance)
-        js_param_index = 1
-        for param in func.parameters:
-            if param.is_instance:
-                # Skip instance parameter
-                continue
-            self.generate_parameter_code(param, js_param_index, cpp_params)
-            js_param_index += 1
-
-        # Handle error parameter
-        error_param_name = None
-        for param in func.parameters:
-            if param.is_error_param():
-                error_param_name = param.name
-                break
-
-        # If function throws but no error param found, add one
-        if func.throws and not error_param_name:
-            error_param_name = "error"
-
-        if error_param_name:
-            self.output.append(f"  GError* {error_param_name} = NULL;")
-
-        # Generate function call
-        if func.return_value.c_type == "void":
-            call_line = f"  {func.c_name}("
-            call_line += ", ".join(cpp_params)
-            if error_param_name:
-                if cpp_params:
-                    call_line += f", &{error_param_name}"
-                else:
-                    call_line += f"&{error_param_name}"
-            call_line += ");"
-            self.output.append(call_line)
-            self.output.append("")
-            result_var = None
-        else:
-            result_var = "result"
-            call_line = f"  {func.return_value.c_type} {result_var} = {func.c_name}("
-            call_line += ", ".join(cpp_params)
-            if error_param_name:
-                if cpp_params:
-                    call_line += f", &{error_param_name}"
-                else:
-                    call_line += f"&{error_param_name}"
-            call_line += ");"
-            self.output.append(call_line)
-            self.output.append("")
-
-        # Error handling
-        if error_param_name:
-            self.output.append(f"  if ({error_param_name}) {{")
-            self.output.append(
-                f"    Napi::Error::New(env, {error_param_name}->message).ThrowAsJavaScriptException();"
-            )
-            self.output.append(f"    g_error_free({error_param_name});")
-            self.output.append("    return env.Null();")
-            self.output.append("  }")
-            self.output.append("")
-
-        # Return conversion
-        if result_var is not None:
-            self.generate_return_conversion(func.return_value, result_var)
-        else:
-            self.generate_return_conversion(func.return_value, "")
-        self.output.append("}")
-        self.output.append("")
 
     def generate_static_method_wrapper(self, cls: Class, func: Function):
         """Generate wrapper for a static method"""
-        self.output.append(
-            f"Napi::Value Wrap_{cls.name}_{func.name}(const Napi::CallbackInfo& info) {{"
-        )
-        self.output.append("  Napi::Env env = info.Env();")
-        self.output.append("")
-
-        # Generate parameter extraction code
-        cpp_params = []
-
-        # JavaScript parameters start at index 0 for static methods
-        for i, param in enumerate(func.parameters):
-            self.generate_parameter_code(param, i, cpp_params)
-
-        # Handle error parameter
-        error_param_name = None
-        for param in func.parameters:
-            if param.is_error_param():
-                error_param_name = param.name
-                break
-
-        # If function throws but no error param found, add one
-        if func.throws and not error_param_name:
-            error_param_name = "error"
-
-        if error_param_name:
-            self.output.append(f"  GError* {error_param_name} = NULL;")
-
-        # Generate function call
-        if func.return_value.c_type == "void":
-            call_line = f"  {func.c_name}("
-            call_line += ", ".join(cpp_params)
-            if error_param_name:
-                if cpp_params:
-                    call_line += f", &{error_param_name}"
-                else:
-                    call_line += f"&{error_param_name}"
-            call_line += ");"
-            self.output.append(call_line)
-            self.output.append("")
-            result_var = None
-        else:
-            result_var = "result"
-            call_line = f"  {func.return_value.c_type} {result_var} = {func.c_name}("
-            call_line += ", ".join(cpp_params)
-            if error_param_name:
-                if cpp_params:
-                    call_line += f", &{error_param_name}"
-                else:
-                    call_line += f"&{error_param_name}"
-            call_line += ");"
-            self.output.append(call_line)
-            self.output.append("")
-
-        # Error handling
-        if error_param_name:
-            self.output.append(f"  if ({error_param_name}) {{")
-            self.output.append(
-                f"    Napi::Error::New(env, {error_param_name}->message).ThrowAsJavaScriptException();"
-            )
-            self.output.append(f"    g_error_free({error_param_name});")
-            self.output.append("    return env.Null();")
-            self.output.append("  }")
-            self.output.append("")
-
-        # Return conversion
-        if result_var is not None:
-            self.generate_return_conversion(func.return_value, result_var)
-        else:
-            self.generate_return_conversion(func.return_value, "")
-        self.output.append("}")
-        self.output.append("")
+        self._generate_wrapper(f"{cls.name}_{func.name}", func)
 
     def generate_function_wrapper(self, func: Function):
         """Generate wrapper for a standalone function"""
-        self.output.append(
-            f"Napi::Value Wrap_{func.c_name}(const Napi::CallbackInfo& info) {{"
-        )
-        self.output.append("  Napi::Env env = info.Env();")
-        self.output.append("")
-
-        # Generate parameter extraction code
-        cpp_params = []
+        self._generate_wrapper(func.c_name, func)
 
-        for i, param in enumerate(func.parameters):
-            self.generate_parameter_code(param, i, cpp_params)
+    def _generate_wrapper(
+        self,
+        wrapper_name: str,
+        func: Function,
+        instance_cls: Optional[Class] = None,
+        skip_instance: bool = False,
+    ):
+        """Generate a wrapper, optionally checking for an instance argument"""
+        write = self.buf.write
+        has_instance = instance_cls is not None
+
+        if not has_instance and not func.parameters and not func.throws:
+            fast_return = FAST_RETURN_TMPLS.get(func.return_value.gir_type)
+            if fast_return is not None:
+                body = fast_return.format(call=f"{func.c_name}()")
+                write(FAST_WRAPPER_TMPL.format(name=wrapper_name, body=body))
+                return
+
+        write(WRAPPER_OPEN_TMPL.format(name=wrapper_name))
+        if has_instance:
+            # First parameter is the instance (this)
+            write(render_instance_check(instance_cls.name, instance_cls.c_name))
+
+        # Wrappers with the same signature only differ in the C function they
+        # call, so the code around its name is rendered once per signature
+        return_value = func.return_value
+        key = (
+            has_instance,
+            skip_instance,
+            func.throws,
+            tuple(
+                (p.name, p.gir_type, p.c_type, p.nullable, p.direction, p.is_instance)
+                for p in func.parameters
+            ),
+            return_value.gir_type,
+            return_value.c_type,
+            return_value.transfer,
+            return_value.element_type,
+        )
+        body = self._wrapper_body_cache.get(key)
+        if body is None:
+            body = self._wrapper_body_cache[key] = self._render_wrapper_body(
+                func, has_instance, skip_instance
+            )
+        head, tail = body
+        write(head)
+        write(func.c_name)
+        write(tail)
+
+    def _render_wrapper_body(
+        self, func: Function, has_instance: bool, skip_instance: bool
+    ) -> Tuple[str, str]:
+        """Render a wrapper's code before and after the called function name"""
+        buf = self.buf
+        try:
+            self.buf = io.StringIO()
+            write = self.buf.write
+
+            if has_instance:
+                cpp_params = ["self"]
+                js_param_index = 1
+            else:
+                cpp_params = []
+                js_param_index = 0
+
+            # Generate parameter extraction code
+            for param in func.parameters:
+                if skip_instance and param.is_instance:
+                    continue
+                self.generate_parameter_code(param, js_param_index, cpp_params)
+                js_param_index += 1
+
+            # Handle error parameter
+            error_param_name = None
+            for param in func.parameters:
+                if param._is_error:
+                    error_param_name = param.name
+                    break
+
+            # If function throws but no error param found, add one
+            if func.throws and not error_param_name:
+                error_param_name = "error"
 
-        # Handle error parameter
-        error_param_name = None
-        for param in func.parameters:
-            if param.is_error_param():
-                error_param_name = param.name
-                break
+            if error_param_name:
+                write(f"  GError* {error_param_name} = NULL;\n")
 
-        # If function throws but no error param found, add one
-        if func.throws and not error_param_name:
-            error_param_name = "error"
+            # Generate function call
+            if func.return_value.c_type == "void":
+                result_var = ""
+                write("  ")
+            else:
+                result_var = "result"
+                write(f"  {func.return_value.c_type} {result_var} = ")
+            head = self.buf.getvalue()
 
-        if error_param_name:
-            self.output.append(f"  GError* {error_param_name} = NULL;")
+            self.buf = io.StringIO()
+            self._write_args(cpp_params, error_param_name)
 
-        # Generate function call
-        if func.return_value.c_type == "void":
-            call_line = f"  {func.c_name}("
-            call_line += ", ".join(cpp_params)
+            # Error handling
             if error_param_name:
-                if cpp_params:
-                    call_line += f", &{error_param_name}"
-                else:
-                    call_line += f"&{error_param_name}"
-            call_line += ");"
-            self.output.append(call_line)
-            self.output.append("")
-            result_var = None
-        else:
-            result_var = "result"
-            call_line = f"  {func.return_value.c_type} {result_var} = {func.c_name}("
-            call_line += ", ".join(cpp_params)
-            if error_param_name:
-                if cpp_params:
-                    call_line += f", &{error_param_name}"
-                else:
-                    call_line += f"&{error_param_name}"
-            call_line += ");"
-            self.output.append(call_line)
-            self.output.append("")
-
-        # Error handling
-        if error_param_name:
-            self.output.append(f"  if ({error_param_name}) {{")
-            self.output.append(
-                f"    Napi::Error::New(env, {error_param_name}->message).ThrowAsJavaScriptException();"
-            )
-            self.output.append(f"    g_error_free({error_param_name});")
-            self.output.append("    return env.Null();")
-            self.output.append("  }")
-            self.output.append("")
+                self.buf.write(render_error_check(error_param_name))
 
-        # Return conversion
-        if result_var is not None:
+            # Return conversion
             self.generate_return_conversion(func.return_value, result_var)
-        else:
-            self.generate_return_conversion(func.return_value, "")
-        self.output.append("}")
-        self.output.append("")
+            self.buf.write(WRAPPER_CLOSE)
+            return head, self.buf.getvalue()
+        finally:
+            self.buf = buf
+
+    def _write_args(self, args: List[str], error_name: Optional[str]):
+        """Write a call's argument list, appending &error when it throws"""
+        if error_name:
+            args = [*args, f"&{error_name}"]
+        self.buf.write(f"({', '.join(args)});\n\n")
 
     def generate_parameter_code(
         self, param: Parameter, index: int, cpp_params: List[str]
     ):
         """Generate code to extract a parameter from JavaScript"""
-        if param.is_error_param():
+        if param._is_error:
             # Skip error parameter - it's handled separately
             return
 
+        # The same parameter shapes recur across a namespace, so each
+        # distinct one is rendered once and its code reused afterwards
+        key = (
+            param.name,
+            param.gir_type,
+            param.c_type,
+            param.nullable,
+            param.direction,
+            index,
+        )
+        cached = self._param_code_cache.get(key)
+        if cached is None:
+            cached = self._param_code_cache[key] = self._render_parameter_code(
+                param, index
+            )
+        code, cpp_arg = cached
+        self.buf.write(code)
+        cpp_params.append(cpp_arg)
+
+    def _render_parameter_code(self, param: Parameter, index: int) -> Tuple[str, str]:
+        """Render the extraction code and C argument for a parameter"""
+        out = []
+        write = out.append
+
         if param.direction != "in":
             # Handle output parameters
             if param.direction == "out":
@@ -1115,776 +1305,638 @@ class CppGenerator:
                     # GObject output parameter (pointer to pointer)
                     # Need to create FlatpakInstance* variable and pass &variable
                     # The C function expects FlatpakInstance** (address of pointer)
-                    self.output.append(f"  {base_type}* {param.name}_local = NULL;")
-                    self.output.append(
-                        f"  {param.c_type} {param.name} = &{param.name}_local;"
-                    )
+                    write(f"  {base_type}* {param.name}_local = NULL;\n")
+                    write(f"  {param.c_type} {param.name} = &{param.name}_local;\n")
                 elif "Flatpak" in param.c_type and not param.is_pointer():
                     # Enum output parameter
-                    self.output.append(f"  {param.c_type} {param.name}_local = 0;")
-                    self.output.append(
-                        f"  {param.c_type}* {param.name} = &{param.name}_local;"
-                    )
+                    write(f"  {param.c_type} {param.name}_local = 0;\n")
+                    write(f"  {param.c_type}* {param.name} = &{param.name}_local;\n")
                 else:
                     # Other output parameter
-                    self.output.append(f"  {base_type} {param.name}_local;")
-                    self.output.append(
-                        f"  {param.c_type} {param.name} = &{param.name}_local;"
-                    )
-                cpp_params.append(param.name)
+                    write(f"  {base_type} {param.name}_local;\n")
+                    write(f"  {param.c_type} {param.name} = &{param.name}_local;\n")
+                cpp_arg = param.name
             else:
                 # inout or unknown direction
-                cpp_params.append("NULL")
-            return
+                cpp_arg = "NULL"
+            return "".join(out), cpp_arg
 
-        elif param.gir_type == "utf8" or param.gir_type == "filename":
-            # Handle nullable string parameters
-            if param.nullable:
-                self.output.append(f"  const char* {param.name} = NULL;")
-                self.output.append(
-                    f"  if (info.Length() > {index} && !info[{index}].IsNull() && !info[{index}].IsUndefined()) {{"
-                )
-                self.output.append(f"    if (!info[{index}].IsString()) {{")
-                self.output.append(
-                    f"      Napi::TypeError::New(env, \"Expected string or null for parameter '{param.name}'\").ThrowAsJavaScriptException();"
-                )
-                self.output.append("      return env.Null();")
-                self.output.append("    }")
-                self.output.append(
-                    f"    std::string {param.name}_str = info[{index}].As<Napi::String>().Utf8Value();"
-                )
-                self.output.append(f"    {param.name} = {param.name}_str.c_str();")
-                self.output.append("  }")
-            else:
-                self.output.append(
-                    f"  if (info.Length() <= {index} || !info[{index}].IsString()) {{"
-                )
-                self.output.append(
-                    f"    Napi::TypeError::New(env, \"Expected string for parameter '{param.name}'\").ThrowAsJavaScriptException();"
-                )
-                self.output.append("    return env.Null();")
-                self.output.append("  }")
-                self.output.append(
-                    f"  std::string {param.name}_str = info[{index}].As<Napi::String>().Utf8Value();"
-                )
-                self.output.append(
-                    f"  const char* {param.name} = {param.name}_str.c_str();"
-                )
-            cpp_params.append(param.name)
-
-        elif param.gir_type == "gboolean":
-            self.output.append(
-                f"  if (info.Length() <= {index} || !info[{index}].IsBoolean()) {{"
-            )
-            self.output.append(
-                f"    Napi::TypeError::New(env, \"Expected boolean for parameter '{param.name}'\").ThrowAsJavaScriptException();"
-            )
-            self.output.append("    return env.Null();")
-            self.output.append("  }")
-            self.output.append(
-                f"  gboolean {param.name} = info[{index}].As<Napi::Boolean>().Value();"
-            )
-            cpp_params.append(param.name)
-
-        elif param.gir_type in [
-            "gint",
-            "guint",
-            "gint8",
-            "guint8",
-            "gint16",
-            "guint16",
-            "gint32",
-            "guint32",
-            "gint64",
-            "guint64",
-            "glong",
-            "gulong",
-            "gshort",
-            "gushort",
-            "gsize",
-            "gssize",
-            "gdouble",
-            "gfloat",
-        ]:
-            self.output.append(
-                f"  if (info.Length() <= {index} || !info[{index}].IsNumber()) {{"
-            )
-            self.output.append(
-                f"    Napi::TypeError::New(env, \"Expected number for parameter '{param.name}'\").ThrowAsJavaScriptException();"
-            )
-            self.output.append("    return env.Null();")
-            self.output.append("  }")
-            if "int" in param.gir_type or param.gir_type in [
-                "glong",
-                "gshort",
-                "gsize",
-                "gssize",
-            ]:
-                if (
-                    "64" in param.gir_type
-                    or param.gir_type == "gint64"
-                    or param.gir_type == "guint64"
-                ):
-                    self.output.append(
-                        f"  {param.c_type} {param.name} = info[{index}].As<Napi::Number>().Int64Value();"
-                    )
-                else:
-                    self.output.append(
-                        f"  {param.c_type} {param.name} = info[{index}].As<Napi::Number>().Int32Value();"
-                    )
-            else:
-                self.output.append(
-                    f"  {param.c_type} {param.name} = info[{index}].As<Napi::Number>().DoubleValue();"
-                )
-            cpp_params.append(param.name)
+        handler = self._param_handlers.get(param.gir_type)
+        if handler is not None:
+            cpp_arg = handler(param, index, write)
 
         # Check for enum types before GObject check
         elif param.is_enum():
             # Enum type - always treat as regular enum value for input parameters
-            self.output.append(
-                f"  if (info.Length() <= {index} || !info[{index}].IsNumber()) {{"
-            )
-            self.output.append(
-                f"    Napi::TypeError::New(env, \"Expected number for enum parameter '{param.name}'\").ThrowAsJavaScriptException();"
-            )
-            self.output.append("    return env.Null();")
-            self.output.append("  }")
             # Remove pointer if present in c_type (treat as regular enum)
-            c_type_without_ptr = param.c_type.rstrip("*").strip()
-            self.output.append(
-                f"  {c_type_without_ptr} {param.name} = static_cast<{c_type_without_ptr}>(info[{index}].As<Napi::Number>().Int32Value());"
+            write(
+                ENUM_PARAM_TMPL.format(
+                    idx=index, name=param.name, c_type=param.c_type.rstrip("*").strip()
+                )
             )
-            cpp_params.append(param.name)
+            cpp_arg = param.name
 
         elif param.is_gobject():
+            # Extract the actual type from c_type (remove *)
+            base_type = param.c_type.rstrip("*").strip()
+            # Ensure base_type is a proper C type (not a GIR type)
+            if base_type == "":
+                base_type = resolve_c_type(param.gir_type.split(".")[-1])
             # Handle nullable GObject parameters
             if param.nullable:
-                self.output.append(f"  {param.c_type} {param.name} = NULL;")
-                self.output.append(
-                    f"  if (info.Length() > {index} && !info[{index}].IsNull() && !info[{index}].IsUndefined()) {{"
-                )
-                self.output.append(f"    if (!info[{index}].IsExternal()) {{")
-                self.output.append(
-                    f"      Napi::TypeError::New(env, \"Expected external object or null for parameter '{param.name}'\").ThrowAsJavaScriptException();"
-                )
-                self.output.append("      return env.Null();")
-                self.output.append("    }")
-                # Extract the actual type from c_type (remove *)
-                base_type = param.c_type.rstrip("*").strip()
-                # Ensure base_type is a proper C type (not a GIR type)
-                if base_type == "":
-                    base_type = param.gir_type.split(".")[-1]
-                    if base_type in [
-                        "File",
-                        "Cancellable",
-                        "Bytes",
-                        "HashTable",
-                        "KeyFile",
-                        "Variant",
-                        "List",
-                        "PtrArray",
-                    ]:
-                        base_type = "G" + base_type
-                    else:
-                        base_type = "Flatpak" + base_type
-                self.output.append(
-                    f"    {param.name} = info[{index}].As<Napi::External<{base_type}>>().Data();"
-                )
-                self.output.append("  }")
+                tmpl = NULLABLE_GOBJECT_PARAM_TMPL
             else:
-                self.output.append(
-                    f"  if (info.Length() <= {index} || !info[{index}].IsExternal()) {{"
-                )
-                self.output.append(
-                    f"    Napi::TypeError::New(env, \"Expected external object for parameter '{param.name}'\").ThrowAsJavaScriptException();"
+                tmpl = GOBJECT_PARAM_TMPL
+            write(
+                tmpl.format(
+                    idx=index, name=param.name, c_type=param.c_type, base_type=base_type
                 )
-                self.output.append("    return env.Null();")
-                self.output.append("  }")
-                # Extract the actual type from c_type (remove *)
-                base_type = param.c_type.rstrip("*").strip()
-                # Ensure base_type is a proper C type (not a GIR type)
-                if base_type == "":
-                    base_type = param.gir_type.split(".")[-1]
-                    if base_type in [
-                        "File",
-                        "Cancellable",
-                        "Bytes",
-                        "HashTable",
-                        "KeyFile",
-                        "Variant",
-                        "List",
-                        "PtrArray",
-                    ]:
-                        base_type = "G" + base_type
-                    else:
-                        base_type = "Flatpak" + base_type
-                self.output.append(
-                    f"  {param.c_type} {param.name} = info[{index}].As<Napi::External<{base_type}>>().Data();"
-                )
-            cpp_params.append(param.name)
+            )
+            cpp_arg = param.name
 
         else:
             # Unknown type, pass as-is
-            self.output.append(
-                f"  // Parameter '{param.name}' of type '{param.gir_type}'"
+            write(f"  // Parameter '{param.name}' of type '{param.gir_type}'\n")
+            write(f"  // TODO: Add proper conversion\n")
+            cpp_arg = f"/* {param.name}: {param.gir_type} */"
+
+        write("\n")
+        return "".join(out), cpp_arg
+
+    def _param_string(self, param: Parameter, index: int, write) -> str:
+        """Extract a string parameter"""
+        # Handle nullable string parameters
+        if param.nullable:
+            write(NULLABLE_STRING_PARAM_TMPL.format(idx=index, name=param.name))
+        else:
+            write(STRING_PARAM_TMPL.format(idx=index, name=param.name))
+        return param.name
+
+    def _param_boolean(self, param: Parameter, index: int, write) -> str:
+        """Extract a boolean parameter"""
+        write(BOOLEAN_PARAM_TMPL.format(idx=index, name=param.name))
+        return param.name
+
+    def _param_number(self, param: Parameter, index: int, write) -> str:
+        """Extract a numeric parameter"""
+        if param.gir_type in INT64_GIR_TYPES:
+            getter = "Int64Value"
+        elif param.gir_type in INTEGER_GIR_TYPES:
+            getter = "Int32Value"
+        else:
+            getter = "DoubleValue"
+        write(
+            NUMBER_PARAM_TMPL.format(
+                idx=index, name=param.name, c_type=param.c_type, getter=getter
             )
-            self.output.append(f"  // TODO: Add proper conversion")
-            cpp_params.append(f"/* {param.name}: {param.gir_type} */")
-
-        self.output.append("")
+        )
+        return param.name
 
     def generate_return_conversion(self, return_value: ReturnValue, var_name: str):
         """Generate code to convert return value to JavaScript"""
-        if return_value.gir_type == "none":
-            self.output.append("  return env.Undefined();")
-            return
-
-        elif return_value.gir_type == "utf8" or return_value.gir_type == "filename":
-            if return_value.transfer in ["full", "container"]:
-                self.output.append(
-                    f'  Napi::String js_result = Napi::String::New(env, {var_name} ? {var_name} : "");'
-                )
-                self.output.append(f"  g_free({var_name});")
-                self.output.append("  return js_result;")
-            else:
-                self.output.append(
-                    f'  return Napi::String::New(env, {var_name} ? {var_name} : "");'
-                )
-
-        elif return_value.gir_type == "gboolean":
-            self.output.append(f"  return Napi::Boolean::New(env, {var_name});")
-
-        elif return_value.gir_type in [
-            "gint",
-            "guint",
-            "gint8",
-            "guint8",
-            "gint16",
-            "guint16",
-            "gint32",
-            "guint32",
-            "gint64",
-            "guint64",
-            "glong",
-            "gulong",
-            "gshort",
-            "gushort",
-            "gsize",
-            "gssize",
-            "gdouble",
-            "gfloat",
-        ]:
-            self.output.append(f"  return Napi::Number::New(env, {var_name});")
-
-        elif return_value.gir_type == "GLib.Quark":
-            self.output.append(f"  return Napi::Number::New(env, {var_name});")
-
-        elif return_value.gir_type == "GLib.Strv":
-            self.output.append(
-                f"  // Convert string array (GLib.Strv) to JavaScript array"
-            )
-            self.output.append(f"  Napi::Array js_array = Napi::Array::New(env);")
-            self.output.append(f"  if ({var_name}) {{")
-            self.output.append(f"    int i = 0;")
-            self.output.append(f"    while ({var_name}[i]) {{")
-            self.output.append(
-                f"      js_array.Set(i, Napi::String::New(env, {var_name}[i]));"
-            )
-            self.output.append(f"      i++;")
-            self.output.append(f"    }}")
-            self.output.append(f"  }}")
-            if return_value.transfer in ["full", "container"]:
-                self.output.append(f"  g_strfreev({var_name});")
-            self.output.append(f"  return js_array;")
-
-        elif return_value.gir_type == "GLib.PtrArray":
-            self.output.append(f"  // Convert GPtrArray to JavaScript array")
-            self.output.append(f"  Napi::Array js_array = Napi::Array::New(env);")
-            self.output.append(f"  if ({var_name}) {{")
-            self.output.append(f"    GPtrArray* array = {var_name};")
-            self.output.append(f"    for (guint i = 0; i < array->len; i++) {{")
-            self.output.append(f"      gpointer item = g_ptr_array_index(array, i);")
-            self.output.append(f"      if (!item) {{")
-            self.output.append(f"        js_array.Set(i, env.Null());")
-            self.output.append(f"        continue;")
-            self.output.append(f"      }}")
-            # Determine element type and wrap appropriately
-            if return_value.element_type:
-                element_type = return_value.element_type
-                # Map GIR type to C type
-                if element_type in [
-                    "InstalledRef",
-                    "RemoteRef",
-                    "Remote",
-                    "Ref",
-                    "RelatedRef",
-                    "TransactionOperation",
-                    "Instance",
-                    "Installation",
-                ]:
-                    # These are Flatpak objects
-                    c_type = f"Flatpak{element_type}*"
-                    self.output.append(
-                        f"      {c_type} typed_item = static_cast<{c_type}>(item);"
-                    )
-                    self.output.append(f"      if (!typed_item) {{")
-                    self.output.append(f"        js_array.Set(i, env.Null());")
-                    self.output.append(f"        continue;")
-                    self.output.append(f"      }}")
-                    self.output.append(
-                        f"      // Increment reference count for GObject"
-                    )
-                    self.output.append(f"      if (G_IS_OBJECT(typed_item)) {{")
-                    self.output.append(f"        g_object_ref(typed_item);")
-                    self.output.append(f"        // Create external with finalizer")
-                    self.output.append(
-                        f"        js_array.Set(i, Napi::External<Flatpak{element_type}>::New(env, typed_item,"
-                    )
-                    self.output.append(
-                        f"          [](Napi::Env env, Flatpak{element_type}* obj) {{"
-                    )
-                    self.output.append(f"            if (obj && G_IS_OBJECT(obj)) {{")
-                    self.output.append(f"              g_object_unref(obj);")
-                    self.output.append(f"            }}")
-                    self.output.append(f"          }}));")
-                    self.output.append(f"      }} else {{")
-                    self.output.append(
-                        f"        // Not a GObject, just pass as external"
-                    )
-                    self.output.append(
-                        f"        js_array.Set(i, Napi::External<Flatpak{element_type}>::New(env, typed_item));"
-                    )
-                    self.output.append(f"      }}")
-                elif element_type in [
-                    "File",
-                    "Cancellable",
-                    "Bytes",
-                    "HashTable",
-                    "KeyFile",
-                    "Variant",
-                    "List",
-                    "PtrArray",
-                ]:
-                    # GLib types
-                    c_type = f"G{element_type}*"
-                    self.output.append(
-                        f"      {c_type} typed_item = static_cast<{c_type}>(item);"
-                    )
-                    self.output.append(f"      if (!typed_item) {{")
-                    self.output.append(f"        js_array.Set(i, env.Null());")
-                    self.output.append(f"        continue;")
-                    self.output.append(f"      }}")
-                    self.output.append(
-                        f"      // Increment reference count for GObject"
-                    )
-                    self.output.append(f"      if (G_IS_OBJECT(typed_item)) {{")
-                    self.output.append(f"        g_object_ref(typed_item);")
-                    self.output.append(f"        // Create external with finalizer")
-                    self.output.append(
-                        f"        js_array.Set(i, Napi::External<G{element_type}>::New(env, typed_item,"
-                    )
-                    self.output.append(
-                        f"          [](Napi::Env env, G{element_type}* obj) {{"
-                    )
-                    self.output.append(f"            if (obj && G_IS_OBJECT(obj)) {{")
-                    self.output.append(f"              g_object_unref(obj);")
-                    self.output.append(f"            }}")
-                    self.output.append(f"          }}));")
-                    self.output.append(f"      }} else {{")
-                    self.output.append(
-                        f"        // Not a GObject, just pass as external"
-                    )
-                    self.output.append(
-                        f"        js_array.Set(i, Napi::External<G{element_type}>::New(env, typed_item));"
-                    )
-                    self.output.append(f"      }}")
-                else:
-                    # Unknown type, fallback to void*
-                    self.output.append(f"      // Unknown element type: {element_type}")
-                    self.output.append(f"      // Try to treat as GObject if possible")
-                    self.output.append(
-                        f"      GObject* gobj = static_cast<GObject*>(item);"
-                    )
-                    self.output.append(f"      if (gobj && G_IS_OBJECT(gobj)) {{")
-                    self.output.append(f"        g_object_ref(gobj);")
-                    self.output.append(f"        // Create external with finalizer")
-                    self.output.append(
-                        f"        js_array.Set(i, Napi::External<void>::New(env, gobj,"
-                    )
-                    self.output.append(f"          [](Napi::Env env, void* obj) {{")
-                    self.output.append(f"            if (obj && G_IS_OBJECT(obj)) {{")
-                    self.output.append(
-                        f"              g_object_unref(static_cast<GObject*>(obj));"
-                    )
-                    self.output.append(f"            }}")
-                    self.output.append(f"          }}));")
-                    self.output.append(f"      }} else {{")
-                    self.output.append(
-                        f"        // Not a GObject, just pass as external"
-                    )
-                    self.output.append(
-                        f"        js_array.Set(i, Napi::External<void>::New(env, item));"
-                    )
-                    self.output.append(f"      }}")
-            else:
-                # No element type info, try to treat as GObject if possible
-                self.output.append(f"      // Try to treat as GObject")
-                self.output.append(
-                    f"      GObject* gobj = static_cast<GObject*>(item);"
-                )
-                self.output.append(f"      if (gobj && G_IS_OBJECT(gobj)) {{")
-                self.output.append(f"        g_object_ref(gobj);")
-                self.output.append(f"        // Create external with finalizer")
-                self.output.append(
-                    f"        js_array.Set(i, Napi::External<void>::New(env, gobj,"
-                )
-                self.output.append(f"          [](Napi::Env env, void* obj) {{")
-                self.output.append(f"            if (obj && G_IS_OBJECT(obj)) {{")
-                self.output.append(
-                    f"              g_object_unref(static_cast<GObject*>(obj));"
-                )
-                self.output.append(f"            }}")
-                self.output.append(f"          }}));")
-                self.output.append(f"      }} else {{")
-                self.output.append(f"        // Not a GObject, just pass as external")
-                self.output.append(
-                    f"        js_array.Set(i, Napi::External<void>::New(env, item));"
-                )
-                self.output.append(f"      }}")
-            self.output.append(f"    }}")
-            self.output.append(f"    // Unref the array but not the contained objects")
-            if return_value.transfer in ["full", "container"]:
-                self.output.append(f"    g_ptr_array_unref({var_name});")
-            self.output.append(f"  }}")
-            self.output.append(f"  return js_array;")
+        handler = self._return_handlers.get(return_value.gir_type)
+        if handler is not None:
+            handler(return_value, var_name)
 
         elif return_value.is_gobject():
             if return_value.gir_type.startswith("Flatpak."):
                 # Check if it's an enum type
-                if (
-                    return_value.gir_type.endswith("Type")
-                    or return_value.gir_type.endswith("Flags")
-                    or return_value.gir_type.endswith("Kind")
-                ):
+                if return_value.gir_type.endswith(ENUM_SUFFIXES):
                     # Enum return type
-                    self.output.append(
-                        f"  return Napi::Number::New(env, static_cast<int32_t>({var_name}));"
+                    self.buf.write(
+                        f"  return Napi::Number::New(env, static_cast<int32_t>({var_name}));\n"
                     )
                 else:
                     # Regular Flatpak object
-                    base_type = return_value.c_type.rstrip("*").strip()
                     # Ensure base_type is proper C type
                     base_type = return_value.c_type.rstrip("*").strip()
                     if base_type == "":
-                        base_type = return_value.gir_type.split(".")[-1]
-                        if base_type in [
-                            "File",
-                            "Cancellable",
-                            "Bytes",
-                            "HashTable",
-                            "KeyFile",
-                            "Variant",
-                            "List",
-                            "PtrArray",
-                        ]:
-                            base_type = "G" + base_type
-                        else:
-                            base_type = "Flatpak" + base_type
-                    self.output.append(f"  if (!{var_name}) {{")
-                    self.output.append(f"    return env.Null();")
-                    self.output.append(f"  }}")
-                    self.output.append(f"  // Increment reference count for GObject")
-                    self.output.append(f"  if (G_IS_OBJECT({var_name})) {{")
-                    self.output.append(f"    g_object_ref({var_name});")
-                    self.output.append(f"    // Create external with finalizer")
-                    self.output.append(
-                        f"    return Napi::External<{base_type}>::New(env, {var_name},"
+                        base_type = resolve_c_type(return_value.gir_type.split(".")[-1])
+                    self.buf.write(f"  if (!{var_name}) {{\n")
+                    self.buf.write(f"    return env.Null();\n")
+                    self.buf.write(f"  }}\n")
+                    self.buf.write(f"  // Increment reference count for GObject\n")
+                    self.buf.write(f"  if (G_IS_OBJECT({var_name})) {{\n")
+                    self.buf.write(f"    g_object_ref({var_name});\n")
+                    self.buf.write(f"    // Create external with finalizer\n")
+                    self.buf.write(
+                        f"    return Napi::External<{base_type}>::New(env, {var_name},\n"
                     )
-                    self.output.append(f"      [](Napi::Env env, {base_type}* obj) {{")
-                    self.output.append(f"        if (obj && G_IS_OBJECT(obj)) {{")
-                    self.output.append(f"          g_object_unref(obj);")
-                    self.output.append(f"        }}")
-                    self.output.append(f"      }});")
-                    self.output.append(f"  }} else {{")
-                    self.output.append(f"    // Not a GObject, just pass as external")
-                    self.output.append(
-                        f"    return Napi::External<{base_type}>::New(env, {var_name});"
+                    self.buf.write(f"      [](Napi::Env env, {base_type}* obj) {{\n")
+                    self.buf.write(f"        if (obj && G_IS_OBJECT(obj)) {{\n")
+                    self.buf.write(f"          g_object_unref(obj);\n")
+                    self.buf.write(f"        }}\n")
+                    self.buf.write(f"      }});\n")
+                    self.buf.write(f"  }} else {{\n")
+                    self.buf.write(f"    // Not a GObject, just pass as external\n")
+                    self.buf.write(
+                        f"    return Napi::External<{base_type}>::New(env, {var_name});\n"
                     )
-                    self.output.append(f"  }}")
+                    self.buf.write(f"  }}\n")
             else:
-                self.output.append(
-                    f"  // Return GObject of type {return_value.gir_type}"
-                )
-                self.output.append(f"  if (!{var_name}) {{")
-                self.output.append(f"    return env.Null();")
-                self.output.append(f"  }}")
-                self.output.append(f"  // Increment reference count for GObject")
-                self.output.append(f"  if (G_IS_OBJECT({var_name})) {{")
-                self.output.append(f"    g_object_ref({var_name});")
-                self.output.append(f"    // Create external with finalizer")
-                self.output.append(
-                    f"    return Napi::External<void>::New(env, {var_name},"
+                self.buf.write(f"  // Return GObject of type {return_value.gir_type}\n")
+                self.buf.write(f"  if (!{var_name}) {{\n")
+                self.buf.write(f"    return env.Null();\n")
+                self.buf.write(f"  }}\n")
+                self.buf.write(f"  // Increment reference count for GObject\n")
+                self.buf.write(f"  if (G_IS_OBJECT({var_name})) {{\n")
+                self.buf.write(f"    g_object_ref({var_name});\n")
+                self.buf.write(f"    // Create external with finalizer\n")
+                self.buf.write(
+                    f"    return Napi::External<void>::New(env, {var_name},\n"
                 )
-                self.output.append(f"      [](Napi::Env env, void* obj) {{")
-                self.output.append(f"        if (obj && G_IS_OBJECT(obj)) {{")
-                self.output.append(
-                    f"          g_object_unref(static_cast<GObject*>(obj));"
+                self.buf.write(f"      [](Napi::Env env, void* obj) {{\n")
+                self.buf.write(f"        if (obj && G_IS_OBJECT(obj)) {{\n")
+                self.buf.write(
+                    f"          g_object_unref(static_cast<GObject*>(obj));\n"
                 )
-                self.output.append(f"        }}")
-                self.output.append(f"      }});")
-                self.output.append(f"  }} else {{")
-                self.output.append(f"    // Not a GObject, just pass as external")
-                self.output.append(
-                    f"    return Napi::External<void>::New(env, {var_name});"
+                self.buf.write(f"        }}\n")
+                self.buf.write(f"      }});\n")
+                self.buf.write(f"  }} else {{\n")
+                self.buf.write(f"    // Not a GObject, just pass as external\n")
+                self.buf.write(
+                    f"    return Napi::External<void>::New(env, {var_name});\n"
                 )
-                self.output.append(f"  }}")
+                self.buf.write(f"  }}\n")
 
         elif return_value.is_enum():
             # Enum return type
-            self.output.append(
-                f"  return Napi::Number::New(env, static_cast<int32_t>({var_name}));"
+            self.buf.write(
+                f"  return Napi::Number::New(env, static_cast<int32_t>({var_name}));\n"
             )
 
         elif return_value.gir_type == "GLib.Bytes":
-            self.output.append(f"  // Convert GBytes to Buffer")
-            self.output.append(f"  gsize buffer_size = 0;")
-            self.output.append(
-                f"  gconstpointer data = g_bytes_get_data({var_name}, &buffer_size);"
+            self.buf.write(f"  // Convert GBytes to Buffer\n")
+            self.buf.write(f"  gsize buffer_size = 0;\n")
+            self.buf.write(
+                f"  gconstpointer data = g_bytes_get_data({var_name}, &buffer_size);\n"
             )
-            self.output.append(
-                f"  Napi::Buffer<uint8_t> buffer = Napi::Buffer<uint8_t>::Copy(env, static_cast<const uint8_t*>(data), buffer_size);"
+            self.buf.write(
+                f"  Napi::Buffer<uint8_t> buffer = Napi::Buffer<uint8_t>::Copy(env, static_cast<const uint8_t*>(data), buffer_size);\n"
             )
             if return_value.transfer in ["full", "container"]:
-                self.output.append(f"  g_bytes_unref({var_name});")
-            self.output.append(f"  return buffer;")
+                self.buf.write(f"  g_bytes_unref({var_name});\n")
+            self.buf.write(f"  return buffer;\n")
 
         elif return_value.gir_type.endswith("[]"):
-            self.output.append(f"  // Convert array of type {return_value.gir_type}")
-            self.output.append(
-                f"  // TODO: Implement array conversion for generic array type"
+            self.buf.write(f"  // Convert array of type {return_value.gir_type}\n")
+            self.buf.write(
+                f"  // TODO: Implement array conversion for generic array type\n"
             )
-            self.output.append(f"  return env.Null();")
+            self.buf.write(f"  return env.Null();\n")
 
         else:
-            self.output.append(f"  // Unknown return type: {return_value.gir_type}")
-            self.output.append(f"  return env.Null();")
+            self.buf.write(f"  // Unknown return type: {return_value.gir_type}\n")
+            self.buf.write(f"  return env.Null();\n")
+
+    def _return_none(self, return_value: ReturnValue, var_name: str):
+        """Return undefined for void functions"""
+        self.buf.write("  return env.Undefined();\n")
+
+    def _return_string(self, return_value: ReturnValue, var_name: str):
+        """Convert a string return value"""
+        write = self.buf.write
+        if return_value.transfer in ["full", "container"]:
+            write(
+                f'  Napi::String js_result = Napi::String::New(env, {var_name} ? {var_name} : "");\n'
+            )
+            write(f"  g_free({var_name});\n")
+            write("  return js_result;\n")
+        else:
+            write(f'  return Napi::String::New(env, {var_name} ? {var_name} : "");\n')
+
+    def _return_boolean(self, return_value: ReturnValue, var_name: str):
+        """Convert a boolean return value"""
+        self.buf.write(f"  return Napi::Boolean::New(env, {var_name});\n")
+
+    def _return_number(self, return_value: ReturnValue, var_name: str):
+        """Convert a numeric or quark return value"""
+        self.buf.write(f"  return Napi::Number::New(env, {var_name});\n")
+
+    def _return_strv(self, return_value: ReturnValue, var_name: str):
+        """Convert a NULL-terminated string array"""
+        write = self.buf.write
+        write(f"  // Convert string array (GLib.Strv) to JavaScript array\n")
+        # Count once so the array is allocated at its final size
+        write(
+            f"  guint strv_len = {var_name} ? g_strv_length(const_cast<gchar**>({var_name})) : 0;\n"
+        )
+        write(f"  Napi::Array js_array = Napi::Array::New(env, strv_len);\n")
+        write(f"  for (guint i = 0; i < strv_len; i++) {{\n")
+        write(f"    js_array.Set(i, Napi::String::New(env, {var_name}[i]));\n")
+        write(f"  }}\n")
+        if return_value.transfer in ["full", "container"]:
+            write(f"  g_strfreev({var_name});\n")
+        write(f"  return js_array;\n")
+
+    def _return_ptr_array(self, return_value: ReturnValue, var_name: str):
+        """Convert a GPtrArray of objects"""
+        write = self.buf.write
+        write(f"  // Convert GPtrArray to JavaScript array\n")
+        write(
+            f"  Napi::Array js_array = Napi::Array::New(env, {var_name} ? {var_name}->len : 0);\n"
+        )
+        write(f"  if ({var_name}) {{\n")
+        write(f"    GPtrArray* array = {var_name};\n")
+        write(f"    for (guint i = 0; i < array->len; i++) {{\n")
+        # Array::Set(uint32_t, ...) is napi_set_element, so the index is
+        # passed through without being boxed into a JS number
+        write(f"      gpointer item = g_ptr_array_index(array, i);\n")
+        write(f"      if (!item) {{\n")
+        write(f"        js_array.Set(i, env.Null());\n")
+        write(f"        continue;\n")
+        write(f"      }}\n")
+        # Determine element type and wrap appropriately
+        if return_value.element_type:
+            element_type = return_value.element_type
+            # Map GIR type to C type: Flatpak objects or GLib types
+            if element_type in FLATPAK_ELEMENT_TYPES or element_type in GLIB_BASE_TYPES:
+                item_type = resolve_c_type(element_type)
+                c_type = f"{item_type}*"
+                # item was checked for NULL above, so typed_item cannot be NULL
+                write(f"      {c_type} typed_item = static_cast<{c_type}>(item);\n")
+                write(f"      // Increment reference count for GObject\n")
+                write(f"      if (G_IS_OBJECT(typed_item)) {{\n")
+                write(f"        g_object_ref(typed_item);\n")
+                write(f"        // Create external with finalizer\n")
+                write(
+                    f"        js_array.Set(i, Napi::External<{item_type}>::New(env, typed_item,\n"
+                )
+                write(f"          [](Napi::Env env, {item_type}* obj) {{\n")
+                write(f"            if (obj && G_IS_OBJECT(obj)) {{\n")
+                write(f"              g_object_unref(obj);\n")
+                write(f"            }}\n")
+                write(f"          }}));\n")
+                write(f"      }} else {{\n")
+                write(f"        // Not a GObject, just pass as external\n")
+                write(
+                    f"        js_array.Set(i, Napi::External<{item_type}>::New(env, typed_item));\n"
+                )
+                write(f"      }}\n")
+            else:
+                # Unknown type, fallback to void*
+                write(f"      // Unknown element type: {element_type}\n")
+                write(f"      // Try to treat as GObject if possible\n")
+                write(f"      GObject* gobj = static_cast<GObject*>(item);\n")
+                write(f"      if (gobj && G_IS_OBJECT(gobj)) {{\n")
+                write(f"        g_object_ref(gobj);\n")
+                write(f"        // Create external with finalizer\n")
+                write(f"        js_array.Set(i, Napi::External<void>::New(env, gobj,\n")
+                write(f"          [](Napi::Env env, void* obj) {{\n")
+                write(f"            if (obj && G_IS_OBJECT(obj)) {{\n")
+                write(f"              g_object_unref(static_cast<GObject*>(obj));\n")
+                write(f"            }}\n")
+                write(f"          }}));\n")
+                write(f"      }} else {{\n")
+                write(f"        // Not a GObject, just pass as external\n")
+                write(
+                    f"        js_array.Set(i, Napi::External<void>::New(env, item));\n"
+                )
+                write(f"      }}\n")
+        else:
+            # No element type info, try to treat as GObject if possible
+            write(f"      // Try to treat as GObject\n")
+            write(f"      GObject* gobj = static_cast<GObject*>(item);\n")
+            write(f"      if (gobj && G_IS_OBJECT(gobj)) {{\n")
+            write(f"        g_object_ref(gobj);\n")
+            write(f"        // Create external with finalizer\n")
+            write(f"        js_array.Set(i, Napi::External<void>::New(env, gobj,\n")
+            write(f"          [](Napi::Env env, void* obj) {{\n")
+            write(f"            if (obj && G_IS_OBJECT(obj)) {{\n")
+            write(f"              g_object_unref(static_cast<GObject*>(obj));\n")
+            write(f"            }}\n")
+            write(f"          }}));\n")
+            write(f"      }} else {{\n")
+            write(f"        // Not a GObject, just pass as external\n")
+            write(f"        js_array.Set(i, Napi::External<void>::New(env, item));\n")
+            write(f"      }}\n")
+        write(f"    }}\n")
+        write(f"    // Unref the array but not the contained objects\n")
+        if return_value.transfer in ["full", "container"]:
+            write(f"    g_ptr_array_unref({var_name});\n")
+        write(f"  }}\n")
+        write(f"  return js_array;\n")
 
     def generate_init_function(self):
         """Generate the N-API module initialization function"""
-        self.output.append("Napi::Object Init(Napi::Env env, Napi::Object exports) {")
-
-        # Export standalone functions with duplicate handling
-        exported_names = set()
-        for func in self.namespace.functions:
-            js_name = func.js_name()
-            # Unconditionally rename quark functions
-            if "quark" in js_name:
-                if func.c_name == "flatpak_error_quark":
-                    js_name = "errorQuark"
-                elif func.c_name == "flatpak_portal_error_quark":
-                    js_name = "portalErrorQuark"
-            # Handle duplicate function names (after quark renaming)
-            if js_name in exported_names:
-                # Add prefix to avoid duplicates
-                js_name = f"{func.c_name.split('_')[0]}_{js_name}"
-            exported_names.add(js_name)
-            self.output.append(
-                f'  exports.Set("{js_name}", Napi::Function::New(env, Wrap_{func.c_name}));'
-            )
+        write = self.buf.write
+        write("Napi::Object Init(Napi::Env env, Napi::Object exports) {\n")
+
+        # Export standalone functions under their unique export names
+        export_names = self.namespace.function_export_names()
+        self._write_define_properties(
+            "exports",
+            [
+                (
+                    export_names[func.c_name],
+                    f"Napi::Function::New<Wrap_{func.c_name}>(env)",
+                )
+                for func in self.namespace.functions
+            ],
+        )
 
         # Export classes
+        class_props = []
         for cls in self.namespace.classes:
-            self.output.append(f"  // {cls.name} class")
-            self.output.append(
-                f"  Napi::Object {cls.name.lower()}_class = Napi::Object::New(env);"
+            cls_name = cls.name
+            cls_var = f"{cls_name.lower()}_class"
+            write(f"  // {cls_name} class\n")
+            write(f"  Napi::Object {cls_var} = Napi::Object::New(env);\n")
+
+            # Export methods; constructors are exposed as "new"
+            self._write_define_properties(
+                cls_var,
+                [
+                    (
+                        "new" if func.is_constructor else func.js_name(),
+                        f"Napi::Function::New<Wrap_{cls_name}_{func.name}>(env)",
+                    )
+                    for func in cls.functions
+                ],
             )
+            class_props.append((cls_name, cls_var))
+        self._write_define_properties("exports", class_props)
 
-            # Export methods
-            for func in cls.functions:
-                if func.is_constructor:
-                    self.output.append(
-                        f'  {cls.name.lower()}_class.Set("new", Napi::Function::New(env, Wrap_{cls.name}_{func.name}));'
-                    )
-                elif func.is_static:
-                    self.output.append(
-                        f'  {cls.name.lower()}_class.Set("{func.js_name()}", Napi::Function::New(env, Wrap_{cls.name}_{func.name}));'
-                    )
-                else:
-                    self.output.append(
-                        f'  {cls.name.lower()}_class.Set("{func.js_name()}", Napi::Function::New(env, Wrap_{cls.name}_{func.name}));'
-                    )
+        write("  return exports;\n")
+        write("}\n")
+        write("\n")
+        write("NODE_API_MODULE(NODE_GYP_MODULE_NAME, Init)")
 
-            self.output.append(
-                f'  exports.Set("{cls.name}", {cls.name.lower()}_class);'
+    def _write_define_properties(self, obj: str, props: List[Tuple[str, str]]):
+        """Define (name, value) properties on obj in a single call"""
+        if not props:
+            return
+        # napi_define_properties internalizes the names, and the attributes
+        # match what Object::Set() would create
+        write = self.buf.write
+        write(f"  {obj}.DefineProperties({{\n")
+        for name, value in props:
+            write(
+                f'    Napi::PropertyDescriptor::Value("{name}", {value}, napi_default_jsproperty),\n'
             )
+        write("  });\n")
+
+
+def render_class_wrappers(cls: Class) -> str:
+    """Render one class's wrappers (runs in a worker process)"""
+    generator = CppGenerator(Namespace(name=cls.name))
+    generator.generate_wrappers_for_class(cls)
+    return generator.buf.getvalue()
+
+
+# -----------------------------------------------------------------------------
+# JavaScript wrapper templates
+# -----------------------------------------------------------------------------
+
+JS_CLASS_HEAD_TMPL = """\
+class {name} {{
+  constructor(handle) {{
+    this._handle = handle;
+  }}
+"""
+
+JS_CLASS_TAIL = """
+  get _native() {
+    return this._handle;
+  }
+}
+"""
+
+# {result} is either "result" or a _wrapArray() call around it
+JS_METHOD_TMPL = """\
+  {name}({params}) {{
+    const result = addon.{owner}.{name}(this._handle{call_params});
+    return {result};
+  }}
+"""
+
+JS_STATIC_METHOD_TMPL = """\
+  static {name}({params}) {{
+    const result = addon.{owner}.{name}({params});
+    return {result};
+  }}
+"""
+
+JS_PROPERTY_GETTER_TMPL = """\
+  get {name}() {{
+    return this.{getter}();
+  }}
+"""
+
+JS_PROPERTY_SETTER_TMPL = """\
+  set {name}(value) {{
+    this.{setter}(value);
+  }}
+"""
 
-        self.output.append("  return exports;")
-        self.output.append("}")
-        self.output.append("")
-        self.output.append("NODE_API_MODULE(NODE_GYP_MODULE_NAME, Init)")
+# Accessor templates keyed by (readable, writable)
+JS_PROPERTY_TMPLS = {
+    (True, False): JS_PROPERTY_GETTER_TMPL,
+    (False, True): JS_PROPERTY_SETTER_TMPL,
+    (True, True): JS_PROPERTY_GETTER_TMPL + "\n" + JS_PROPERTY_SETTER_TMPL,
+}
+
+JS_FACTORY_TMPL = """\
+{cls_name}.create = function({params}) {{
+  const handle = addon.{cls_name}.new({params});
+  return new {cls_name}(handle);
+}};
+"""
+
+# Emitted once; wraps the elements of a returned GLib.PtrArray in their
+# JavaScript class
+JS_WRAP_ARRAY_HELPER = """\
+function _wrapArray(arr, Cls) {
+  if (!Array.isArray(arr)) return arr;
+  return arr.map(item => {
+    if (!item) return item;
+    // Check if already wrapped
+    if (item._native !== undefined) return item;
+    return new Cls(item);
+  });
+}
+"""
+
+# Standalone functions are followed by a blank line
+JS_FUNCTION_TMPL = """\
+function {name}({params}) {{
+  const result = addon.{name}({params});
+  return {result};
+}}
+
+"""
 
 
 class JavaScriptGenerator:
     def __init__(self, namespace: Namespace):
         self.namespace = namespace
-        self.output = []
         self.class_names = [cls.name for cls in namespace.classes]
+        # GIR element types that map directly onto a JavaScript class; only
+        # classes emitted into this file can be referenced by _wrapArray()
+        self.wrapper_classes = frozenset(self.class_names)
         # Map class name to Class object for parent lookup
         self.class_map = {cls.name: cls for cls in namespace.classes}
+        # Each class followed by its ancestors among the generated classes
+        self.mro: Dict[str, List[Class]] = {}
+        for cls in namespace.classes:
+            chain = []
+            current = cls
+            while current:
+                chain.append(current)
+                current = self.class_map.get(current.parent)
+            self.mro[cls.name] = chain
+        self._members_cache: Dict[
+            str, Tuple[List[Function], List[Function], List[Property]]
+        ] = {}
 
     def generate(self) -> str:
         """Generate JavaScript wrapper code"""
-        self.output = []
-        self.output.append("// Generated by generate_from_gir.py")
-        self.output.append("// DO NOT EDIT THIS FILE DIRECTLY")
-        self.output.append("")
-        self.output.append("const addon = require('./build/Release/flatpak.node');")
-        self.output.append("")
-
-        for cls in self.namespace.classes:
-            self.generate_class(cls)
-            self.output.append("")
+        out = io.StringIO()
+        self.write_to(out)
+        return out.getvalue()
+
+    def write_to(self, out: TextIO):
+        """Generate JavaScript wrapper code straight into a text stream"""
+        # Each write is a whole block (header, class or function); blocks
+        # are separated by a newline
+        out.write(
+            "// Generated by generate_from_gir.py\n"
+            "// DO NOT EDIT THIS FILE DIRECTLY\n"
+            "\n"
+            "const addon = require('./build/Release/flatpak.node');\n"
+        )
+        out.write("\n")
+        out.write(JS_WRAP_ARRAY_HELPER)
+
+        classes = self.namespace.classes
+        if len(classes) >= PARALLEL_CLASS_THRESHOLD:
+            # Each worker builds its own generator from the namespace once;
+            # map() keeps the output order
+            with ProcessPoolExecutor(
+                initializer=init_js_worker, initargs=(self.namespace,)
+            ) as executor:
+                for chunk in executor.map(render_js_class, range(len(classes))):
+                    out.write("\n")
+                    out.write(chunk)
+        else:
+            for cls in classes:
+                out.write("\n")
+                out.write(self.generate_class(cls))
 
         # Compute unique export names for functions
-        function_export_map = self._get_function_export_map()
+        function_export_map = self.namespace.function_export_names()
 
         # Generate standalone functions
         for func in self.namespace.functions:
             export_name = function_export_map[func.c_name]
-            self.generate_function_export(func, export_name)
-            self.output.append("")
-
-        self.generate_exports(function_export_map)
-
-        return "\n".join(self.output)
-
-    def hyphen_to_camel(self, name: str) -> str:
-        """Convert hyphenated string to camelCase"""
-        parts = name.split("-")
-        if not parts:
-            return name
-        # First part remains lowercase
-        result = parts[0]
-        # Capitalize remaining parts
-        for part in parts[1:]:
-            if part:
-                result += part[0].upper() + part[1:]
-        return result
-
-    def generate_class(self, cls: Class):
+            out.write("\n")
+            out.write(self.generate_function_export(func, export_name))
+
+        out.write("\n")
+        out.write(self.generate_exports(function_export_map))
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def hyphen_to_camel(name: str) -> str:
+        """Convert hyphenated string to camelCase (memoized per distinct name)"""
+        head, _, tail = name.partition("-")
+        if not tail:
+            return head
+        # First part remains lowercase; capitalize only the first letter of
+        # the remaining parts (str.title would also lowercase the rest)
+        return head + "".join(part[:1].upper() + part[1:] for part in tail.split("-"))
+
+    def generate_class(self, cls: Class) -> str:
         """Generate JavaScript class wrapper"""
-        self.output.append(f"class {cls.name} {{")
-        self.output.append("  constructor(handle) {")
-        self.output.append("    this._handle = handle;")
-        self.output.append("  }")
-        self.output.append("")
-
         # Collect all methods from class hierarchy
-        all_methods = self._collect_methods_from_hierarchy(cls)
-        all_static_methods = self._collect_static_methods_from_hierarchy(cls)
-        all_properties = self._collect_properties_from_hierarchy(cls)
+        all_methods, all_static_methods, all_properties = (
+            self._collect_members_from_hierarchy(cls)
+        )
+
+        # Blocks are written into one buffer, each preceded by a newline
+        out = io.StringIO()
+        write = out.write
+        write(JS_CLASS_HEAD_TMPL.format(name=cls.name))
 
         # Generate static methods
         for func in all_static_methods:
-            self.generate_static_method(cls, func)
+            write("\n")
+            write(self.generate_static_method(cls, func))
 
         # Generate instance methods
         for func in all_methods:
             if not func.is_constructor:
-                self.generate_method(cls, func)
+                write("\n")
+                write(self.generate_method(cls, func))
 
         # Generate property getters/setters
         for prop in all_properties:
-            if prop.readable:
-                self.generate_property_getter(prop)
-            if prop.writable:
-                self.generate_property_setter(prop)
-
-        self.output.append("")
-        self.output.append("  get _native() {")
-        self.output.append("    return this._handle;")
-        self.output.append("  }")
-        self.output.append("}")
-        self.output.append("")
+            if prop.readable or prop.writable:
+                write("\n")
+                write(self.generate_property(prop))
+
+        write("\n")
+        write(JS_CLASS_TAIL)
 
         # Generate constructor factory
-        self.generate_constructor_factory(cls)
+        factory = self.generate_constructor_factory(cls)
+        if factory:
+            write("\n")
+            write(factory)
+
+        # Classes are separated by a blank line
+        write("\n")
+        return out.getvalue()
+
+    def _collect_members_from_hierarchy(
+        self, cls: Class
+    ) -> Tuple[List[Function], List[Function], List[Property]]:
+        """Collect methods, static methods and properties from the hierarchy"""
+        # One walk per class collects all three; results are memoized
+        cls_name = cls.name
+        members = self._members_cache.get(cls_name)
+        if members is not None:
+            return members
 
-    def _collect_methods_from_hierarchy(self, cls: Class) -> list:
-        """Collect all instance methods from class hierarchy"""
         methods = []
-        seen_names = set()
-
-        # Traverse hierarchy
-        current = cls
-        while current:
-            # Add methods from current class (child overrides parent)
-            for func in current.functions:
-                if not func.is_constructor and not func.is_static:
-                    if func.js_name() not in seen_names:
-                        methods.append(func)
-                        seen_names.add(func.js_name())
-
-            # Move to parent if exists in our generated classes
-            if current.parent and current.parent in self.class_map:
-                current = self.class_map[current.parent]
-            else:
-                break
-
-        return methods
-
-    def _collect_static_methods_from_hierarchy(self, cls: Class) -> list:
-        """Collect all static methods from class hierarchy"""
         static_methods = []
-        seen_names = set()
+        properties = []
+        seen_methods = set()
+        seen_static_methods = set()
+        seen_properties = set()
 
-        # Traverse hierarchy
-        current = cls
-        while current:
-            # Add static methods from current class
+        # Traverse hierarchy; child members override parent ones
+        for current in self.mro[cls_name]:
             for func in current.functions:
+                js_name = func.js_name()
                 if func.is_static:
-                    if func.js_name() not in seen_names:
+                    if js_name not in seen_static_methods:
                         static_methods.append(func)
-                        seen_names.add(func.js_name())
-
-            # Move to parent if exists in our generated classes
-            if current.parent and current.parent in self.class_map:
-                current = self.class_map[current.parent]
-            else:
-                break
-
-        return static_methods
-
-    def _collect_properties_from_hierarchy(self, cls: Class) -> list:
-        """Collect all properties from class hierarchy"""
-        properties = []
-        seen_names = set()
+                        seen_static_methods.add(js_name)
+                elif not func.is_constructor:
+                    if js_name not in seen_methods:
+                        methods.append(func)
+                        seen_methods.add(js_name)
 
-        # Traverse hierarchy
-        current = cls
-        while current:
-            # Add properties from current class
             for prop in current.properties:
-                if prop.name not in seen_names:
+                if prop.name not in seen_properties:
                     properties.append(prop)
-                    seen_names.add(prop.name)
+                    seen_properties.add(prop.name)
 
-            # Move to parent if exists in our generated classes
-            if current.parent and current.parent in self.class_map:
-                current = self.class_map[current.parent]
-            else:
-                break
-
-        return properties
+        members = self._members_cache[cls_name] = (methods, static_methods, properties)
+        return members
 
     def _find_method_owner(
         self, cls: Class, method_name: str, is_static: bool = False
     ) -> str:
         """Find which class in the hierarchy owns a method"""
+        cls_name = cls.name
+        chain = self.mro[cls_name]
+        # Without a generated parent the answer is always the class itself
+        if len(chain) == 1:
+            return cls_name
         # Traverse hierarchy from child to parent
-        current = cls
-        while current:
+        for current in chain:
             # Check if method exists in current class
             for func in current.functions:
                 if not func.is_constructor:
@@ -1892,192 +1944,158 @@ class JavaScriptGenerator:
                         if func.js_name() == method_name:
                             return current.name
 
-            # Move to parent if exists in our generated classes
-            if current.parent and current.parent in self.class_map:
-                current = self.class_map[current.parent]
-            else:
-                break
-
         # If not found, return the original class name
-        return cls.name
+        return cls_name
 
-    def generate_method(self, cls: Class, func: Function):
+    def generate_method(self, cls: Class, func: Function) -> str:
         """Generate instance method"""
         js_name = func.js_name()
-        params = ", ".join([p.name for p in func.parameters if not p.is_instance])
+        params = func.js_method_params()
 
         # Find which class actually owns this method
         owner_class = self._find_method_owner(cls, js_name, is_static=False)
 
-        self.output.append(f"  {js_name}({params}) {{")
-        self.output.append(
-            f"    const result = addon.{owner_class}.{js_name}(this._handle{', ' + params if params else ''});"
+        return JS_METHOD_TMPL.format(
+            name=js_name,
+            params=params,
+            owner=owner_class,
+            call_params=", " + params if params else "",
+            result=self._wrap_result(func.return_value, "result"),
         )
-        self._generate_array_wrapping(func.return_value, "result")
-        self.output.append(f"    return result;")
-        self.output.append("  }")
-        self.output.append("")
 
-    def generate_static_method(self, cls: Class, func: Function):
+    def generate_static_method(self, cls: Class, func: Function) -> str:
         """Generate static method"""
         js_name = func.js_name()
-        params = ", ".join([p.name for p in func.parameters])
+        params = func.js_params()
 
         # Find which class actually owns this static method
         owner_class = self._find_method_owner(cls, js_name, is_static=True)
 
-        self.output.append(f"  static {js_name}({params}) {{")
-        self.output.append(
-            f"    const result = addon.{owner_class}.{js_name}({params});"
+        return JS_STATIC_METHOD_TMPL.format(
+            name=js_name,
+            params=params,
+            owner=owner_class,
+            result=self._wrap_result(func.return_value, "result"),
         )
-        self._generate_array_wrapping(func.return_value, "result")
-        self.output.append(f"    return result;")
-        self.output.append(f"  }}")
-        self.output.append("")
-
-    def generate_property_getter(self, prop: Property):
-        """Generate property getter"""
-        getter_name = prop.getter_name()
-        # Convert hyphenated property names to camelCase
-        prop_name = self.hyphen_to_camel(prop.name)
-        self.output.append(f"  get {prop_name}() {{")
-        self.output.append(f"    return this.{getter_name}();")
-        self.output.append("  }")
-        self.output.append("")
-
-    def generate_property_setter(self, prop: Property):
-        """Generate property setter"""
-        setter_name = prop.setter_name()
-        # Convert hyphenated property names to camelCase
-        prop_name = self.hyphen_to_camel(prop.name)
-        self.output.append(f"  set {prop_name}(value) {{")
-        self.output.append(f"    this.{setter_name}(value);")
-        self.output.append("  }")
-        self.output.append("")
-
-    def _get_wrapper_class(self, element_type: str) -> str:
-        """Return JavaScript wrapper class name for element type"""
-        # Map GIR type names to JavaScript class names
-        # Some GIR types match JavaScript class names directly
-        if element_type in self.class_names:
-            return element_type
 
-        # Special cases
-        if element_type == "BundleRef":
-            return "BundleRef"
-
-        # Check for common Flatpak types that might not be in class_names
-        # but are part of the API
-        flatpak_types = [
-            "InstalledRef",
-            "RemoteRef",
-            "Remote",
-            "Ref",
-            "RelatedRef",
-            "TransactionOperation",
-            "Instance",
-            "Installation",
-        ]
-        if element_type in flatpak_types:
-            return element_type
+    def generate_property(self, prop: Property) -> str:
+        """Generate property getter and/or setter"""
+        tmpl = JS_PROPERTY_TMPLS.get((prop.readable, prop.writable))
+        if tmpl is None:
+            return ""
+        return tmpl.format(
+            # Convert hyphenated property names to camelCase
+            name=self.hyphen_to_camel(prop.name),
+            getter=prop.getter_name(),
+            setter=prop.setter_name(),
+        )
 
-        # For GLib types or unknown types, return None (no wrapper)
+    def _get_wrapper_class(self, element_type: str) -> Optional[str]:
+        """Return JavaScript wrapper class name for element type"""
+        # GLib types and unknown types have no wrapper
+        if element_type in self.wrapper_classes:
+            return element_type
         return None
 
-    def _generate_array_wrapping(self, return_value, var_name: str):
-        """Generate code to wrap array elements if needed"""
+    def _wrap_result(self, return_value, var_name: str) -> str:
+        """Return the expression that wraps array elements if needed"""
         if return_value.gir_type == "GLib.PtrArray" and return_value.element_type:
-            element_type = return_value.element_type
             # Check if element type has a wrapper class
-            wrapper_class = self._get_wrapper_class(element_type)
+            wrapper_class = self._get_wrapper_class(return_value.element_type)
             if wrapper_class:
-                self.output.append(f"    if (Array.isArray({var_name})) {{")
-                self.output.append(f"      return {var_name}.map(item => {{")
-                self.output.append(f"        if (!item) return item;")
-                self.output.append(f"        // Check if already wrapped")
-                self.output.append(
-                    f"        if (item._native !== undefined) return item;"
-                )
-                self.output.append(f"        // Wrap in appropriate class")
-                self.output.append(f"        const wrapperClass = {wrapper_class};")
-                self.output.append(
-                    f"        return wrapperClass ? new wrapperClass(item) : item;"
-                )
-                self.output.append(f"      }});")
-                self.output.append(f"    }}")
+                return f"_wrapArray({var_name}, {wrapper_class})"
+        return var_name
 
-    def generate_constructor_factory(self, cls: Class):
+    def generate_constructor_factory(self, cls: Class) -> str:
         """Generate constructor factory function"""
         # Find constructors
         constructors = [f for f in cls.functions if f.is_constructor]
-        if constructors:
-            # Use the first constructor
-            constr = constructors[0]
-            params = ", ".join([p.name for p in constr.parameters if not p.is_instance])
-
-            self.output.append(f"{cls.name}.create = function({params}) {{")
-            self.output.append(f"  const handle = addon.{cls.name}.new({params});")
-            self.output.append(f"  return new {cls.name}(handle);")
-            self.output.append("};")
-            self.output.append("")
-
-    def generate_function_export(self, func: Function, export_name: str = None):
+        if not constructors:
+            return ""
+        # Use the first constructor
+        constr = constructors[0]
+        params = constr.js_method_params()
+
+        return JS_FACTORY_TMPL.format(cls_name=cls.name, params=params)
+
+    def generate_function_export(self, func: Function, export_name: str = None) -> str:
         """Generate standalone function export"""
         if export_name is None:
             export_name = func.js_name()
-        params = ", ".join([p.name for p in func.parameters])
-
-        self.output.append(f"function {export_name}({params}) {{")
-        self.output.append(f"  const result = addon.{export_name}({params});")
-        self._generate_array_wrapping(func.return_value, "result")
-        self.output.append(f"  return result;")
-        self.output.append("}")
-        self.output.append("")
+        params = func.js_params()
 
-    def _get_function_export_map(self):
-        """Return mapping from function to unique export name"""
-        exported_names = set()
-        mapping = {}
-        for func in self.namespace.functions:
-            js_name = func.js_name()
-            # Unconditionally rename quark functions
-            if "quark" in js_name:
-                if func.c_name == "flatpak_error_quark":
-                    js_name = "errorQuark"
-                elif func.c_name == "flatpak_portal_error_quark":
-                    js_name = "portalErrorQuark"
-            # Handle duplicate function names (after quark renaming)
-            if js_name in exported_names:
-                # Add prefix to avoid duplicates
-                js_name = f"{func.c_name.split('_')[0]}_{js_name}"
-            exported_names.add(js_name)
-            mapping[func.c_name] = js_name
-        return mapping
+        return JS_FUNCTION_TMPL.format(
+            name=export_name,
+            params=params,
+            result=self._wrap_result(func.return_value, "result"),
+        )
 
-    def generate_exports(self, function_export_map=None):
+    def generate_exports(self, function_export_map=None) -> str:
         """Generate exports section"""
-        self.output.append("// Exports")
-        self.output.append("module.exports = {")
-
-        # Export classes
-        class_exports = []
-        for cls in self.namespace.classes:
-            class_exports.append(f"  {cls.name}")
-
-        # Export standalone functions
-        function_exports = []
         if function_export_map is None:
             # Fallback: compute map ourselves
-            function_export_map = self._get_function_export_map()
+            function_export_map = self.namespace.function_export_names()
 
-        for func in self.namespace.functions:
-            export_name = function_export_map[func.c_name]
-            function_exports.append(f"  {export_name}")
+        # Classes first, then standalone functions
+        all_exports = [f"  {cls.name}" for cls in self.namespace.classes]
+        all_exports += [
+            f"  {function_export_map[func.c_name]}" for func in self.namespace.functions
+        ]
+        return "// Exports\nmodule.exports = {\n" + ",\n".join(all_exports) + "\n};"
+
+
+# Per-process generator used by render_js_class
+_js_worker: Optional[JavaScriptGenerator] = None
+
+
+def init_js_worker(namespace: Namespace):
+    """Build the worker process's JavaScript generator"""
+    global _js_worker
+    _js_worker = JavaScriptGenerator(namespace)
 
-        # Combine all exports
-        all_exports = class_exports + function_exports
-        self.output.append(",\n".join(all_exports))
-        self.output.append("};")
+
+def render_js_class(index: int) -> str:
+    """Render one class by position in the namespace (runs in a worker process)"""
+    return _js_worker.generate_class(_js_worker.namespace.classes[index])
+
+
+# First line of each generated file; records the inputs it was built from
+INPUT_HASH_HEADER = "// gir-hash: {}\n"
+
+
+def compute_input_hash(gir_file: str) -> str:
+    """Hash the GIR file together with this generator's own source"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(Path(gir_file).read_bytes())
+    # Changes to the generator must invalidate previous output as well
+    digest.update(Path(__file__).read_bytes())
+    return digest.hexdigest()
+
+
+def is_up_to_date(output_file: str, input_hash: str) -> bool:
+    """Check whether output_file was generated from the given inputs"""
+    try:
+        with open(output_file) as f:
+            return f.readline() == INPUT_HASH_HEADER.format(input_hash)
+    except OSError:
+        return False
+
+
+def write_output(output_file: str, input_hash: str, generator):
+    """Write generator output, replacing output_file only once it is complete"""
+    # A matching hash header must never sit on top of a truncated file
+    tmp_file = f"{output_file}.tmp"
+    try:
+        with open(tmp_file, "w") as f:
+            f.write(INPUT_HASH_HEADER.format(input_hash))
+            generator.write_to(f)
+        os.replace(tmp_file, output_file)
+    except BaseException:
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+        raise
 
 
 def main():
@@ -2094,6 +2112,11 @@ def main():
         "--output-js", default="index.js", help="Output JavaScript file"
     )
     parser.add_argument("--verbose", action="store_true", help="Enable verbose output")
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Regenerate even if the outputs match the GIR file",
+    )
 
     args = parser.parse_args()
 
@@ -2101,6 +2124,13 @@ def main():
         print(f"Error: GIR file not found: {args.gir}")
         sys.exit(1)
 
+    input_hash = compute_input_hash(args.gir)
+    if not args.force and all(
+        is_up_to_date(path, input_hash) for path in (args.output_cpp, args.output_js)
+    ):
+        print("Bindings are up to date")
+        return
+
     print(f"Parsing GIR file: {args.gir}")
     parser = GIRParser(args.gir)
     namespace = parser.parse()
@@ -2111,19 +2141,15 @@ def main():
     # Generate C++ bindings
     print(f"Generating C++ bindings: {args.output_cpp}")
     cpp_generator = CppGenerator(namespace)
-    cpp_code = cpp_generator.generate()
 
     os.makedirs(os.path.dirname(args.output_cpp), exist_ok=True)
-    with open(args.output_cpp, "w") as f:
-        f.write(cpp_code)
+    write_output(args.output_cpp, input_hash, cpp_generator)
 
     # Generate JavaScript bindings
     print(f"Generating JavaScript bindings: {args.output_js}")
     js_generator = JavaScriptGenerator(namespace)
-    js_code = js_generator.generate()
 
-    with open(args.output_js, "w") as f:
-        f.write(js_code)
+    write_output(args.output_js, input_hash, js_generator)
 
     print("Done!")
 